@@ -0,0 +1 @@
+"""Performance benchmarks for WhisperType — run with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,326 @@
+"""End-to-end dictation latency benchmark.
+
+Runs the start -> record -> stop -> trim -> transcribe -> inject pipeline
+headlessly: deterministic audio is fed through the real ``AudioRecorder``
+by a fake sounddevice stream, decoded by ``Transcriber`` and handed to a
+null text injector.  Reports p50/p95 per stage and the real-time factor for every
+model size x compute type x decode profile, and saves JSON so runs can be
+compared.
+
+    python -m benchmarks.latency --models tiny base --compute-types int8
+    python -m benchmarks.latency --audio fixture.wav --json after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+BLOCK_FRAMES = 512
+STAGES = ("start", "stop", "trim", "transcribe", "inject", "stop_to_text")
+
+
+# ---------------------------------------------------------------------------
+# Audio sources
+# ---------------------------------------------------------------------------
+
+def synthetic_speech(seconds=5.0, seed=0):
+    """Deterministic speech-like signal: voiced harmonics in syllable bursts.
+
+    Whisper will not produce meaningful text from it, but it exercises VAD
+    and the decoder with a realistic envelope.  Prefer ``--audio`` with a
+    real recording for decoder timings.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    f0 = 120 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    signal = 0.25 * voiced * syllables + 0.003 * rng.standard_normal(n)
+    # Half a second of room noise on both ends, like a real dictation.
+    pad = 0.003 * rng.standard_normal(SAMPLE_RATE // 2)
+    audio = np.concatenate([pad, signal, pad])
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+def load_audio(path):
+    from faster_whisper import decode_audio
+    audio = decode_audio(path, sampling_rate=SAMPLE_RATE)
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+
+
+# ---------------------------------------------------------------------------
+# Fakes
+# ---------------------------------------------------------------------------
+
+class FakeInputStream:
+    """Stands in for ``sounddevice.InputStream`` and plays back fixture audio.
+
+    The 16 kHz mono fixture is converted to whatever format the recorder
+    opens (``device_rate`` / ``device_channels`` by default), so the
+    recorder's own downmix and resampling are part of the measurement.
+    """
+
+    source = np.zeros(0, dtype=np.int16)
+    realtime = False
+    device_rate = SAMPLE_RATE
+    device_channels = 1
+    current = None  # the most recently opened stream
+    _converted = {}
+
+    def __init__(self, samplerate, channels, dtype, callback, **_kwargs):
+        self._callback = callback
+        self._rate = int(samplerate)
+        self._data = self._convert(self._rate, channels, dtype)
+        self._thread = None
+        self._stop = threading.Event()
+        self.finished = threading.Event()
+        self.active = False
+        FakeInputStream.current = self
+
+    @classmethod
+    def _convert(cls, rate, channels, dtype):
+        key = (id(cls.source), rate, channels, dtype)
+        if key not in cls._converted:
+            from voice_app.services.resample import PolyphaseResampler
+
+            audio = cls.source.astype(np.float32) * (1.0 / 32768.0)
+            if rate != SAMPLE_RATE:
+                audio = PolyphaseResampler(SAMPLE_RATE, rate).process(audio)
+            if dtype == "int16":
+                audio = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+            cls._converted = {key: np.repeat(audio.reshape(-1, 1), channels, axis=1)}
+        return cls._converted[key]
+
+    def start(self):
+        self.active = True
+        self._thread = threading.Thread(target=self._feed, daemon=True)
+        self._thread.start()
+
+    def _feed(self):
+        block_frames = BLOCK_FRAMES * self._rate // SAMPLE_RATE
+        block_s = block_frames / self._rate
+        source = self._data
+        for i in range(0, len(source), block_frames):
+            if self._stop.is_set():
+                break
+            block = source[i:i + block_frames]
+            self._callback(block, len(block), None, None)
+            if self.realtime:
+                time.sleep(block_s)
+        self.finished.set()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.active = False
+
+    def close(self):
+        pass
+
+
+def _query_devices(device=None, kind=None):
+    return {
+        "name": "fake",
+        "default_samplerate": float(FakeInputStream.device_rate),
+        "max_input_channels": FakeInputStream.device_channels,
+    }
+
+
+def install_fake_sounddevice():
+    module = types.ModuleType("sounddevice")
+    module.InputStream = FakeInputStream
+    module.query_devices = _query_devices
+    sys.modules["sounddevice"] = module
+
+
+def null_injector():
+    from voice_app.services.platform.base import PlatformTextInjector
+
+    class NullTextInjector(PlatformTextInjector):
+        def __init__(self):
+            self.injected = []
+
+        def inject_text(self, text, target_window_id=None, preserve_clipboard=True):
+            self.injected.append(text)
+
+    return NullTextInjector()
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+def run_dictation(recorder, transcriber, injector, language, prompt):
+    """Time one dictation; returns ``(timings, text)``, or None if nothing was captured."""
+    from voice_app.services.vad import speech_bounds
+
+    timings = {}
+    # Hotkey -> recording: opening the stream (or arming a warm one).
+    ts = time.perf_counter()
+    recorder.start()
+    timings["start"] = time.perf_counter() - ts
+    FakeInputStream.current.finished.wait()
+
+    t0 = time.perf_counter()
+    audio = recorder.stop()
+    t1 = time.perf_counter()
+    if audio is None or len(audio) == 0:
+        return None
+    bounds = speech_bounds(audio, recorder.vad)
+    if bounds is not None:
+        audio = audio[bounds[0]:bounds[1]]
+    t2 = time.perf_counter()
+    text = transcriber.transcribe(audio, language=language, initial_prompt=prompt)
+    t3 = time.perf_counter()
+    injector.inject_text(text)
+    t4 = time.perf_counter()
+
+    timings["stop"] = t1 - t0
+    timings["trim"] = t2 - t1
+    timings["transcribe"] = t3 - t2
+    timings["inject"] = t4 - t3
+    timings["stop_to_text"] = t4 - t0
+    timings["rtf"] = (t3 - t2) / (len(audio) / SAMPLE_RATE)
+    return timings, text
+
+
+def percentiles(values):
+    arr = np.asarray(values)
+    return {
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "mean": float(arr.mean()),
+    }
+
+
+def bench_config(model, compute_type, profile, audio, args):
+    from voice_app.services.recorder import AudioRecorder
+    from voice_app.services.transcriber import Transcriber
+
+    FakeInputStream.source = audio
+    FakeInputStream.realtime = args.realtime
+
+    transcriber = Transcriber()
+    t0 = time.perf_counter()
+    transcriber.load_model(model_name=model, compute_type=compute_type, profile=profile)
+    load_s = time.perf_counter() - t0
+
+    recorder = AudioRecorder()
+    injector = null_injector()
+    samples = {k: [] for k in STAGES + ("rtf",)}
+    text = ""
+    skipped = 0
+    for i in range(args.warmup + args.runs):
+        run = run_dictation(recorder, transcriber, injector, args.language, args.prompt)
+        if i < args.warmup:
+            continue
+        if run is None:
+            skipped += 1
+            continue
+        timings, text = run
+        for k, v in timings.items():
+            samples[k].append(v)
+    if not samples["stop"]:
+        raise RuntimeError(f"{model} / {compute_type} / {profile}: recorder captured no audio")
+
+    return {
+        "model": model,
+        "compute_type": compute_type,
+        "profile": profile,
+        "audio_seconds": len(audio) / SAMPLE_RATE,
+        "load_seconds": load_s,
+        "runs": args.runs - skipped,
+        "skipped": skipped,
+        "stages": {k: percentiles(samples[k]) for k in STAGES},
+        "rtf": percentiles(samples["rtf"]),
+        "text": text,
+    }
+
+
+def print_result(r, baseline=None):
+    print(f"\n{r['model']} / {r['compute_type']} / {r['profile']}  "
+          f"({r['audio_seconds']:.1f} s audio, load {r['load_seconds']:.2f} s)")
+    if r.get("skipped"):
+        print(f"  skipped {r['skipped']} run(s) with no captured audio")
+    for stage in STAGES:
+        s = r["stages"][stage]
+        line = f"  {stage:13s} p50 {s['p50'] * 1000:8.1f} ms   p95 {s['p95'] * 1000:8.1f} ms"
+        if baseline:
+            # Results saved before a stage existed have no entry for it.
+            old = baseline["stages"].get(stage, {}).get("p50")
+            if old:
+                line += f"   ({(s['p50'] - old) / old * 100:+.0f}% p50)"
+        print(line)
+    print(f"  {'rtf':13s} p50 {r['rtf']['p50']:8.3f}      p95 {r['rtf']['p95']:8.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", nargs="+", default=["base"])
+    parser.add_argument("--compute-types", nargs="+", default=["int8"])
+    parser.add_argument("--profiles", nargs="+", default=["auto"],
+                        help="decode profiles: fast, balanced, accurate, auto")
+    parser.add_argument("--audio", help="fixture audio file (default: synthetic)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="synthetic audio length")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--prompt", default=None, help="initial_prompt for decoding")
+    parser.add_argument("--device-rate", type=int, default=SAMPLE_RATE,
+                        help="native sample rate of the simulated microphone")
+    parser.add_argument("--device-channels", type=int, default=1,
+                        help="channel count of the simulated microphone")
+    parser.add_argument("--realtime", action="store_true",
+                        help="feed audio at real-time pace instead of as fast as possible")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier results JSON to diff against")
+    args = parser.parse_args(argv)
+
+    install_fake_sounddevice()
+    FakeInputStream.device_rate = args.device_rate
+    FakeInputStream.device_channels = args.device_channels
+    audio = load_audio(args.audio) if args.audio else synthetic_speech(args.seconds)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            for r in json.load(f)["results"]:
+                baseline[(r["model"], r["compute_type"], r.get("profile", "auto"))] = r
+
+    results = []
+    for model in args.models:
+        for compute_type in args.compute_types:
+            for profile in args.profiles:
+                r = bench_config(model, compute_type, profile, audio, args)
+                results.append(r)
+                print_result(r, baseline.get((model, compute_type, profile)))
+
+    if args.json:
+        meta = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "audio": args.audio or f"synthetic:{args.seconds}s",
+            "realtime": args.realtime,
+            "device_rate": args.device_rate,
+            "device_channels": args.device_channels,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Startup benchmark: time-to-first-paint and time-to-ready.
+
+Launches ``python -X importtime -m voice_app`` with startup tracing enabled,
+waits for the app to report that the model is loaded, and prints the two
+milestones (measured from process spawn) plus the slowest imports.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --offscreen --json startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+_MARK_RE = re.compile(r"^\[startup\] (\w+) ([\d.]+)$")
+_IMPORT_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def run_once(model=None, offscreen=False, timeout=300):
+    env = dict(os.environ, WHISPERTYPE_STARTUP_TRACE="exit")
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    cmd = [sys.executable, "-X", "importtime", "-m", "voice_app"]
+    if model:
+        cmd.append(model)
+
+    spawned = time.monotonic()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, timeout=timeout)
+
+    marks = {}
+    imports = []
+    for line in proc.stderr.splitlines():
+        m = _MARK_RE.match(line)
+        if m:
+            marks[m.group(1)] = float(m.group(2)) - spawned
+            continue
+        m = _IMPORT_RE.match(line)
+        if m and len(m.group(3)) == 1:  # top-level imports only
+            imports.append((int(m.group(2)) / 1e6, m.group(4)))
+
+    if "ready" not in marks:
+        raise RuntimeError(f"App did not report ready (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+    imports.sort(reverse=True)
+    return marks, imports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--model", help="model name override passed to the app")
+    parser.add_argument("--offscreen", action="store_true", help="use Qt's offscreen platform")
+    parser.add_argument("--top", type=int, default=10, help="number of slow imports to list")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    runs = []
+    imports = []
+    for i in range(args.runs):
+        marks, imports = run_once(args.model, args.offscreen)
+        runs.append(marks)
+        print(f"run {i + 1}: " + "  ".join(f"{k}={v * 1000:.0f}ms" for k, v in marks.items()))
+
+    summary = {}
+    for key in ("main", "first_paint", "ready"):
+        values = [r[key] for r in runs if key in r]
+        if values:
+            summary[key] = {"median_s": statistics.median(values), "min_s": min(values)}
+            print(f"{key:12s} median {summary[key]['median_s'] * 1000:7.0f} ms"
+                  f"   min {summary[key]['min_s'] * 1000:7.0f} ms")
+
+    print("\nSlowest top-level imports (last run):")
+    for seconds, name in imports[:args.top]:
+        print(f"  {seconds * 1000:7.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs, "summary": summary,
+                       "imports": [[n, s] for s, n in imports[:args.top]]}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""X11 focus / terminal-detection benchmark: xdotool subprocesses vs python-xlib.
+
+Times the three window queries every dictation makes on Linux — save the
+active window, re-activate it, and look up its WM_CLASS for terminal
+detection — once through ``xdotool`` and once through the persistent
+python-xlib connection.  Needs a running X server (or Xvfb).
+
+    python -m benchmarks.x11 --runs 50
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+def _xdotool_dictation():
+    wid = subprocess.run(["xdotool", "getactivewindow"],
+                         capture_output=True, text=True, timeout=2).stdout.strip()
+    if wid:
+        subprocess.run(["xdotool", "windowactivate", wid], capture_output=True, timeout=2)
+        subprocess.run(["xdotool", "getwindowclassname", wid],
+                       capture_output=True, text=True, timeout=2)
+
+
+def _xlib_dictation(conn):
+    wid = conn.active_window()
+    if wid:
+        conn.activate(wid)
+        conn.window_class(wid)
+
+
+def _time(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    arr = np.asarray(samples) * 1000
+    return {"p50_ms": float(np.percentile(arr, 50)), "p95_ms": float(np.percentile(arr, 95)),
+            "mean_ms": float(arr.mean())}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    from voice_app.services.platform._x11 import get_connection
+
+    results = {}
+    if shutil.which("xdotool"):
+        results["xdotool"] = _time(_xdotool_dictation, args.runs)
+    else:
+        print("xdotool not installed; skipping", file=sys.stderr)
+    conn = get_connection()
+    if conn is not None:
+        results["xlib"] = _time(lambda: _xlib_dictation(conn), args.runs)
+    else:
+        print("No X11 connection (python-xlib missing or DISPLAY unset); skipping",
+              file=sys.stderr)
+    if not results:
+        return 1
+
+    for name, r in results.items():
+        print(f"{name:8s} per dictation  p50 {r['p50_ms']:7.2f} ms   "
+              f"p95 {r['p95_ms']:7.2f} ms")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
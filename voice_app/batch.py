@@ -0,0 +1,216 @@
+"""Headless batch transcription — ``whispertype transcribe FILE_OR_DIR...``.
+
+Uses the same model and settings as the overlay (``model``, ``model_path``,
+``compute_type``, ``language``, ``initial_prompt``).  A reader thread decodes
+files ahead of time into a bounded queue while N workers share one model
+loaded with ``num_workers=N``, so decoding and transcription overlap.
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+
+from voice_app.config.settings import load_config
+from voice_app.services.model_cache import get_model_cache
+from voice_app.services.transcriber import Transcriber
+
+SAMPLE_RATE = 16000
+AUDIO_EXTENSIONS = (".wav", ".flac", ".mp3", ".ogg", ".opus", ".m4a", ".webm")
+
+_DONE = object()
+_stats_lock = threading.Lock()
+
+
+def find_audio_files(paths):
+    """Yield audio files from *paths*, descending into directories."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(AUDIO_EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif os.path.isfile(path):
+            yield path
+        else:
+            print(f"Not found: {path}", file=sys.stderr)
+
+
+def _format_timestamp(seconds):
+    ms = int(round(seconds * 1000))
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def write_srt(path, segments):
+    with open(path, "w", encoding="utf-8") as f:
+        for i, seg in enumerate(segments, 1):
+            f.write(f"{i}\n{_format_timestamp(seg.start)} --> {_format_timestamp(seg.end)}\n"
+                    f"{seg.text}\n\n")
+
+
+class _Writer:
+    """Serialise results from the worker threads to JSONL or SRT."""
+
+    def __init__(self, fmt, output, files=()):
+        self.fmt = fmt
+        self.output = output
+        self._lock = threading.Lock()
+        self._jsonl = None
+        self._root = None
+        if fmt == "jsonl":
+            self._jsonl = open(output, "w", encoding="utf-8") if output else sys.stdout
+        elif output:
+            os.makedirs(output, exist_ok=True)
+            # Mirror the inputs' layout below their common directory so
+            # a/talk.wav and b/talk.wav don't both become talk.srt.
+            try:
+                self._root = os.path.commonpath(
+                    [os.path.dirname(os.path.abspath(f)) for f in files])
+            except ValueError:  # no files, or paths on different drives
+                self._root = None
+
+    def _srt_path(self, path):
+        stem = os.path.splitext(path)[0]
+        if not self.output:
+            return stem + ".srt"
+        stem = os.path.abspath(stem)
+        if self._root is not None:
+            rel = os.path.relpath(stem, self._root)
+        else:
+            rel = os.path.splitdrive(stem)[1].lstrip("\\/")
+        dest = os.path.join(self.output, rel + ".srt")
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        return dest
+
+    def write(self, path, duration, segments):
+        if self.fmt == "srt":
+            write_srt(self._srt_path(path), segments)
+            return
+        record = {
+            "path": path,
+            "duration": round(duration, 3),
+            "text": " ".join(seg.text for seg in segments).strip(),
+            "segments": [[round(seg.start, 3), round(seg.end, 3), seg.text] for seg in segments],
+        }
+        with self._lock:
+            self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._jsonl.flush()
+
+    def close(self):
+        if self._jsonl is not None and self._jsonl is not sys.stdout:
+            self._jsonl.close()
+
+
+def _reader(files, jobs, workers, stats):
+    from faster_whisper import decode_audio
+
+    for path in files:
+        try:
+            audio = decode_audio(path, sampling_rate=SAMPLE_RATE)
+        except Exception as e:
+            print(f"Decode error: {path}: {e}", file=sys.stderr)
+            with _stats_lock:
+                stats["failed"] += 1
+            continue
+        jobs.put((path, audio))
+    for _ in range(workers):
+        jobs.put(_DONE)
+
+
+def _worker(transcriber, jobs, writer, stats, language, initial_prompt):
+    # Segment times end up in the output, so always decode with timestamps.
+    while True:
+        job = jobs.get()
+        if job is _DONE:
+            return
+        path, audio = job
+        duration = len(audio) / SAMPLE_RATE
+        try:
+            segments = transcriber.transcribe_segments(
+                audio, language=language, initial_prompt=initial_prompt, timestamps=True,
+            )
+            writer.write(path, duration, segments)
+        except Exception as e:
+            print(f"Transcription error: {path}: {e}", file=sys.stderr)
+            with _stats_lock:
+                stats["failed"] += 1
+            continue
+        with _stats_lock:
+            stats["files"] += 1
+            stats["audio_seconds"] += duration
+            done = stats["files"]
+        print(f"[{done}] {path} ({duration:.1f}s)", file=sys.stderr)
+
+
+def transcribe_main(argv=None):
+    """Entry point for ``whispertype transcribe``."""
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="whispertype transcribe",
+                                     description="Transcribe audio files without the overlay.")
+    parser.add_argument("paths", nargs="+", help="audio files or directories")
+    parser.add_argument("-f", "--format", choices=("jsonl", "srt"), default="jsonl")
+    parser.add_argument("-o", "--output",
+                        help="JSONL file (default stdout) or SRT directory (default next to input)")
+    parser.add_argument("-w", "--workers", type=int, default=2,
+                        help="parallel transcriptions (model num_workers)")
+    parser.add_argument("--cpu-threads", type=int, default=0,
+                        help="threads per worker (0 = library default)")
+    parser.add_argument("--model", default=config["model"])
+    parser.add_argument("--model-path", default=config.get("model_path"))
+    parser.add_argument("--compute-type", default=config.get("compute_type", "int8"))
+    parser.add_argument("--language", default=config.get("language") or None)
+    parser.add_argument("--initial-prompt", default=config.get("initial_prompt") or None)
+    parser.add_argument("--profile", default=config.get("decode_profile", "auto"),
+                        help="decode profile: fast, balanced, accurate or auto")
+    args = parser.parse_args(argv)
+
+    files = list(find_audio_files(args.paths))
+    if not files:
+        print("No audio files found.", file=sys.stderr)
+        return 1
+    workers = max(1, min(args.workers, len(files)))
+
+    print(f"Loading model {args.model} ({args.compute_type}, {workers} workers)...",
+          file=sys.stderr)
+    transcriber = Transcriber()
+    transcriber.load_model(
+        model_name=args.model, model_path=args.model_path, compute_type=args.compute_type,
+        cpu_threads=args.cpu_threads, num_workers=workers, profile=args.profile,
+        cache=get_model_cache(config),
+    )
+
+    writer = _Writer(args.format, args.output, files)
+    jobs = queue.Queue(maxsize=workers * 2)
+    stats = {"files": 0, "failed": 0, "audio_seconds": 0.0}
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=_reader, args=(files, jobs, workers, stats), daemon=True)]
+    threads += [
+        threading.Thread(target=_worker, daemon=True,
+                         args=(transcriber, jobs, writer, stats, args.language, args.initial_prompt))
+        for _ in range(workers)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            t.join()
+    finally:
+        writer.close()
+    wall = time.perf_counter() - start
+
+    speed = stats["audio_seconds"] / wall if wall > 0 else 0.0
+    print(
+        f"Transcribed {stats['files']} files ({stats['failed']} failed): "
+        f"{stats['audio_seconds']:.1f} s of audio in {wall:.1f} s — "
+        f"{speed:.2f} audio-seconds per wall-second",
+        file=sys.stderr,
+    )
+    return 0 if stats["failed"] == 0 else 2
@@ -1,6 +1,10 @@
+import atexit
 import json
 import os
 import sys
+import tempfile
+import threading
+import time
 
 
 def _config_dir():
@@ -24,46 +28,383 @@ DEFAULTS = {
     "model": "base",
     "model_path": None,
     "compute_type": "int8",
+    # Keep hub models in a local, hash-indexed cache so launches and model
+    # switches work offline; None for the default cache directory.
+    "model_cache": True,
+    "model_cache_dir": None,
+    # Offered in the tray / right-click menu for switching without a restart.
+    "model_choices": ["tiny", "base", "small", "medium", "large-v3"],
+    "compute_type_choices": ["int8", "int16", "float32"],
     "hotkey": "ctrl+shift+space",
     "language": "en",
     "initial_prompt": "Indian English speaker. Common terms: lakh, crore, rupees, Chennai, Bengaluru, Mumbai, Delhi, Hyderabad, Kerala, Tamil Nadu, Karnataka.",
     "prepend_space": True,
     "sound_feedback": True,
     "silence_timeout": 1,
+    # Decoding preset from DECODE_PROFILES, or "auto" to choose by length.
+    "decode_profile": "auto",
+    # Optional larger model that re-decodes each dictation in the background
+    # and offers its transcript as a one-click correction.
+    "refine_model": None,
+    "refine_profile": "accurate",
+    # Decode while recording so only the last few seconds remain at stop.
+    "streaming": False,
+    # With streaming: type words into the target window as they are
+    # recognised instead of pasting everything at the end.
+    "live_typing": False,
+    # Keep the microphone open while idle so recordings start instantly and
+    # include the preroll_ms of audio from just before the hotkey.  The OS
+    # will show the microphone as in use.
+    "warm_capture": False,
+    "preroll_ms": 500,
+    # Voice activity detector: "energy" or "silero" (bundled with faster-whisper).
+    "vad": "energy",
+    # Drop leading/trailing silence before decoding.
+    "vad_trim": True,
+    # Use a shared `whispertype serve` daemon when one is running.
+    "model_server": False,
+    "model_server_socket": None,
+    # Opt-in latency tracing: JSONL log path and/or local HTTP port for
+    # rolling per-stage percentiles (http://127.0.0.1:<port>/metrics).
+    "metrics_log": None,
+    "metrics_port": None,
 }
 
 
-def _ensure_dir():
-    os.makedirs(_DIR, exist_ok=True)
+# Named decoding presets.  beam_size, best_of, temperature, without_timestamps
+# and condition_on_previous_text are passed to WhisperModel.transcribe;
+# cpu_threads and num_workers apply when the model is loaded (0 = library
+# default).  "auto" picks "fast" for utterances up to AUTO_FAST_MAX_SECONDS
+# and "balanced" for longer ones.
+DECODE_PROFILES = {
+    "fast": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": [0.0],
+        "without_timestamps": True,
+        "condition_on_previous_text": False,
+        "cpu_threads": 0,
+        "num_workers": 1,
+    },
+    "balanced": {
+        "beam_size": 2,
+        "best_of": 2,
+        "temperature": [0.0, 0.4, 0.8],
+        "without_timestamps": True,
+        "condition_on_previous_text": False,
+        "cpu_threads": 0,
+        "num_workers": 1,
+    },
+    "accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+        "without_timestamps": False,
+        "condition_on_previous_text": True,
+        "cpu_threads": 0,
+        "num_workers": 1,
+    },
+}
+AUTO_FAST_MAX_SECONDS = 10.0
 
 
-def load_config():
-    _ensure_dir()
-    if os.path.exists(_CONFIG_PATH):
-        with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
-            stored = json.load(f)
-        cfg = {**DEFAULTS, **stored}
-    else:
-        cfg = dict(DEFAULTS)
-        save_config(cfg)
+# Accepted types for each setting; stored values that don't fit are
+# replaced by the default (with a warning) instead of failing at startup.
+# Keys not listed here are passed through untouched.
+_NONE = type(None)
+SCHEMA = {
+    "model": str,
+    "model_path": (str, _NONE),
+    "compute_type": str,
+    "model_cache": bool,
+    "model_cache_dir": (str, _NONE),
+    "model_choices": list,
+    "compute_type_choices": list,
+    "hotkey": str,
+    "language": (str, _NONE),
+    "initial_prompt": (str, _NONE),
+    "prepend_space": bool,
+    "sound_feedback": bool,
+    "silence_timeout": (int, float),
+    "decode_profile": str,
+    "refine_model": (str, _NONE),
+    "refine_profile": str,
+    "streaming": bool,
+    "live_typing": bool,
+    "warm_capture": bool,
+    "preroll_ms": (int, float),
+    "vad": str,
+    "vad_trim": bool,
+    "model_server": bool,
+    "model_server_socket": (str, _NONE),
+    "metrics_log": (str, _NONE),
+    "metrics_port": (int, _NONE),
+}
+# Settings limited to a fixed set of values.
+CHOICES = {
+    "decode_profile": ("auto", *DECODE_PROFILES),
+    "refine_profile": tuple(DECODE_PROFILES),
+    "vad": ("energy", "silero"),
+}
+
+# Writes are delayed this long (seconds) so bursts of changes, such as a
+# drag or several menu picks, become one write.
+SAVE_DELAY = 0.5
+# How often the config file is checked for outside edits (seconds).
+WATCH_INTERVAL = 1.0
+
+
+def _valid(key, value):
+    types = SCHEMA.get(key)
+    if types is None:
+        return True
+    if not isinstance(types, tuple):
+        types = (types,)
+    # bool is an int subclass; only accept it where a bool is expected.
+    if isinstance(value, bool) and bool not in types:
+        return False
+    if not isinstance(value, types):
+        return False
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value < 0:
+        return False
+    return key not in CHOICES or value in CHOICES[key]
+
+
+def validate_config(stored):
+    """Return DEFAULTS overlaid with the valid entries of *stored*."""
+    cfg = dict(DEFAULTS)
+    if not isinstance(stored, dict):
+        print("[WhisperType] config.json is not a JSON object; using defaults",
+              file=sys.stderr)
+        return cfg
+    for key, value in stored.items():
+        if _valid(key, value):
+            cfg[key] = value
+        else:
+            print(f"[WhisperType] Ignoring invalid config value {key}={value!r}; "
+                  f"using {DEFAULTS.get(key)!r}", file=sys.stderr)
     return cfg
 
 
+def _read_json(path):
+    """Return the parsed file, or None if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[WhisperType] Cannot read {path}, using defaults: {e}", file=sys.stderr)
+        return None
+
+
+def _write_json_atomic(path, data, indent=None):
+    """Write *data* to a temp file beside *path*, then rename it into place.
+
+    Readers (and a crash mid-write) see either the old file or the new one,
+    never a truncated one.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-",
+                               suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class SettingsStore:
+    """Config and overlay position, read once and written behind.
+
+    ``save_*`` calls return immediately; a background thread writes the
+    latest value of each file ``delay`` seconds after the last change,
+    atomically.  Pending writes are flushed at interpreter exit.  ``watch``
+    polls ``config.json`` and reports edits made outside the app.
+    """
+
+    def __init__(self, config_path=_CONFIG_PATH, position_path=_POSITION_PATH,
+                 delay=SAVE_DELAY):
+        self.config_path = config_path
+        self.position_path = position_path
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._pending = {}  # path -> (data, indent, due time, seq)
+        self._seq = 0
+        self._written = {}  # path -> seq of the last write, so none goes backwards
+        self._write_lock = threading.Lock()
+        self._writer = None
+        self._disk_config = None  # last config read from or written to disk
+        self._config_sig = None
+        self._watcher = None
+        self._closed = False
+
+    # -- Config --------------------------------------------------------
+
+    def load_config(self):
+        stored = _read_json(self.config_path)
+        cfg = validate_config(stored if stored is not None else {})
+        if stored is None and not os.path.exists(self.config_path):
+            try:
+                _write_json_atomic(self.config_path, cfg, indent=2)
+            except OSError as e:
+                print(f"[WhisperType] Cannot write {self.config_path}: {e}", file=sys.stderr)
+        with self._cond:
+            self._disk_config = dict(cfg)
+            self._config_sig = _signature(self.config_path)
+        return cfg
+
+    def save_config(self, cfg):
+        with self._cond:
+            self._disk_config = dict(cfg)
+        self._schedule(self.config_path, dict(cfg), indent=2)
+
+    # -- Overlay position ----------------------------------------------
+
+    def load_position(self):
+        data = _read_json(self.position_path)
+        if not isinstance(data, dict):
+            return None, None
+        x, y = data.get("x"), data.get("y")
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (x, y)):
+            return None, None
+        return x, y
+
+    def save_position(self, x, y):
+        self._schedule(self.position_path, {"x": x, "y": y})
+
+    # -- Write-behind --------------------------------------------------
+
+    def _schedule(self, path, data, indent=None):
+        with self._cond:
+            self._seq += 1
+            self._pending[path] = (data, indent, time.monotonic() + self.delay, self._seq)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)
+            self._cond.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    now = time.monotonic()
+                    due = [p for p, entry in self._pending.items() if entry[2] <= now]
+                    if due:
+                        break
+                    timeout = min((entry[2] for entry in self._pending.values()), default=None)
+                    self._cond.wait(None if timeout is None else timeout - now)
+                if self._closed:
+                    return
+                writes = [(p, self._pending.pop(p)) for p in due]
+            for path, entry in writes:
+                self._write(path, *entry)
+
+    def _write(self, path, data, indent, due, seq):
+        with self._write_lock:
+            if self._written.get(path, 0) > seq:
+                return
+            self._written[path] = seq
+            try:
+                _write_json_atomic(path, data, indent=indent)
+            except OSError as e:
+                print(f"[WhisperType] Cannot write {path}: {e}", file=sys.stderr)
+                return
+            if path == self.config_path:
+                with self._cond:
+                    # Our own write is not an outside edit.
+                    self._config_sig = _signature(path)
+
+    def flush(self):
+        """Write everything still pending now (blocking)."""
+        with self._cond:
+            writes = list(self._pending.items())
+            self._pending.clear()
+        for path, entry in writes:
+            self._write(path, *entry)
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # -- Hot reload ----------------------------------------------------
+
+    def watch(self, callback, interval=WATCH_INTERVAL):
+        """Call ``callback(config, changed_keys)`` when config.json is edited.
+
+        The callback runs on the watcher thread.  Invalid files are reported
+        and skipped until they are fixed.
+        """
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch_loop, args=(callback, interval),
+                                         daemon=True)
+        self._watcher.start()
+
+    def _watch_loop(self, callback, interval):
+        while not self._closed:
+            time.sleep(interval)
+            sig = _signature(self.config_path)
+            with self._cond:
+                if sig is None or sig == self._config_sig or self.config_path in self._pending:
+                    continue
+                self._config_sig = sig
+            stored = _read_json(self.config_path)
+            if stored is None:
+                continue
+            cfg = validate_config(stored)
+            with self._cond:
+                previous, self._disk_config = self._disk_config or {}, dict(cfg)
+            changed = {k for k in set(cfg) | set(previous) if cfg.get(k) != previous.get(k)}
+            if changed:
+                try:
+                    callback(cfg, changed)
+                except Exception as e:
+                    print(f"[WhisperType] Config reload failed: {e}", file=sys.stderr)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the shared :class:`SettingsStore`."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SettingsStore()
+        return _store
+
+
+def load_config():
+    return get_store().load_config()
+
+
 def save_config(cfg):
-    _ensure_dir()
-    with open(_CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2)
+    get_store().save_config(cfg)
 
 
 def load_position():
-    if os.path.exists(_POSITION_PATH):
-        with open(_POSITION_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data.get("x"), data.get("y")
-    return None, None
+    return get_store().load_position()
 
 
 def save_position(x, y):
-    _ensure_dir()
-    with open(_POSITION_PATH, "w", encoding="utf-8") as f:
-        json.dump({"x": x, "y": y}, f)
+    get_store().save_position(x, y)
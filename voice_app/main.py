@@ -1,18 +1,28 @@
+import os
 import sys
 import threading
 import time
+from collections import deque
 
 from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtWidgets import QApplication
 
-from voice_app.services.recorder import AudioRecorder
-from voice_app.config.settings import load_config, save_config, load_position, save_position
-from voice_app.services.transcriber import Transcriber
-from voice_app.services.focus_manager import FocusManager
-from voice_app.services.text_injector import inject_text
-from voice_app.services.platform import get_sound_player, get_hotkey_manager
+from voice_app.config.settings import get_store
+from voice_app.services.tracing import tracer
 from voice_app.ui.overlay_window import OverlayWindow
 
+# Service modules (numpy, sounddevice, faster_whisper, platform adapters) are
+# imported in OverlayApp._init_services, after the overlay has painted.
+
+# Set WHISPERTYPE_STARTUP_TRACE=1 to print startup milestones to stderr
+# ("exit" also quits once the model is ready, or fails to load) — see benchmarks/startup.py.
+_STARTUP_TRACE = os.environ.get("WHISPERTYPE_STARTUP_TRACE", "")
+
+
+def _startup_mark(name):
+    if _STARTUP_TRACE:
+        print(f"[startup] {name} {time.monotonic():.6f}", file=sys.stderr, flush=True)
+
 
 class _Invoker(QObject):
     """Thread-safe helper to schedule callables on the main thread."""
@@ -29,21 +39,51 @@ class _Invoker(QObject):
         self._call.emit(fn)
 
 
+# A recording at least this long is decoded even if the VAD finds no speech
+# in it, in case the VAD is wrong; shorter ones are dropped as too short.
+UNTRIMMED_MIN_SECONDS = 1.0
+
+# Settings only read at startup; editing them in config.json needs a restart.
+RESTART_KEYS = {
+    "model_cache", "model_cache_dir", "refine_model", "refine_profile", "vad",
+    "preroll_ms", "model_server", "model_server_socket", "metrics_log", "metrics_port",
+}
+
+
 class OverlayApp:
     def __init__(self, config):
         self.config = config
+        self.settings = get_store()
         self.state = "loading"
+        tracer.configure(log_path=config.get("metrics_log"), port=config.get("metrics_port"))
 
         self.app = QApplication.instance() or QApplication(sys.argv)
         self._invoker = _Invoker()
 
-        self.recorder = AudioRecorder()
-        self.transcriber = Transcriber()
-        self.focus_mgr = FocusManager()
-        self.sound = get_sound_player()
-        self.hotkey_mgr = get_hotkey_manager()
-
-        pos = load_position()
+        self.recorder = None
+        self.transcriber = None
+        self.focus_mgr = None
+        self.sound = None
+        self.hotkey_mgr = None
+        self.model_cache = None
+        self.refiner = None
+        self._switching = None
+        self._switch_queued = None  # (model, model_path, compute_type) from a config edit
+        self._stream_session = None
+        self._live = None
+        self._refine_gen = 0
+        self._pending_correction = None
+        # Stopped recordings: decoded by self.jobs, then pasted in order.
+        self.jobs = None
+        self._outstanding = 0
+        self._paste_queue = deque()
+        self._pasting = False
+        self._recording_focus = None
+        self._stages = tracer.stages()  # the current recording's StageClock
+        # A warm_capture change that arrived mid-recording, applied at stop.
+        self._warm_pending = False
+
+        pos = self.settings.load_position()
         self.window = OverlayWindow(
             None,
             on_click=self._on_button_click,
@@ -51,8 +91,43 @@ class OverlayApp:
             on_cancel=self._on_cancel_click,
             initial_pos=pos,
             on_drag_end=self._on_drag_end,
+            on_first_paint=self._on_first_paint,
+            on_select_model=self.switch_model,
         )
         self.window.set_state("loading")
+        # Fallback in case the window never gets a paint event.
+        QTimer.singleShot(1000, self._init_services)
+
+    def _on_first_paint(self):
+        _startup_mark("first_paint")
+        QTimer.singleShot(0, self._init_services)
+
+    def _init_services(self):
+        if self.recorder is not None:
+            return
+        from voice_app.services.recorder import AudioRecorder
+        from voice_app.services.transcriber import Transcriber
+        from voice_app.services.vad import get_vad
+        from voice_app.services.focus_manager import FocusManager
+        from voice_app.services.job_queue import TranscriptionQueue
+        from voice_app.services.model_cache import get_model_cache
+        from voice_app.services.platform import get_sound_player, get_hotkey_manager
+
+        # Start paging cached weights in while the rest of startup runs.
+        self.model_cache = get_model_cache(self.config)
+        if self.model_cache is not None and not self.config.get("model_path"):
+            self.model_cache.prefetch_async(self.config["model"])
+            if self.config.get("refine_model"):
+                self.model_cache.prefetch_async(self.config["refine_model"])
+
+        self.recorder = AudioRecorder(vad=get_vad(self.config.get("vad", "energy")),
+                                      preroll=self.config.get("preroll_ms", 500) / 1000)
+        self.window.set_level_meter(self.recorder.meter)
+        self.transcriber = Transcriber()
+        self.focus_mgr = FocusManager()
+        self.sound = get_sound_player()
+        self.hotkey_mgr = get_hotkey_manager()
+        self.jobs = TranscriptionQueue(self._transcribe_job, self._on_job_decoded)
 
         t = threading.Thread(target=self._load_model, daemon=True)
         t.start()
@@ -61,25 +136,228 @@ class OverlayApp:
 
     def _load_model(self):
         try:
-            self.transcriber.load_model(
-                model_name=self.config["model"],
-                model_path=self.config.get("model_path"),
-                compute_type=self.config.get("compute_type", "int8"),
-            )
+            self.recorder.warm_up()
+            if self.config["sound_feedback"]:
+                self.sound.warm_up()
+            if self.config.get("warm_capture"):
+                try:
+                    self.recorder.keep_warm()
+                except Exception as e:
+                    print(f"Mic error, using on-demand capture: {e}", file=sys.stderr)
+            if not (self.config.get("model_server") and self._connect_model_server()):
+                with tracer.span("model.load"):
+                    self.transcriber.load_model(
+                        model_name=self.config["model"],
+                        model_path=self.config.get("model_path"),
+                        compute_type=self.config.get("compute_type", "int8"),
+                        profile=self.config.get("decode_profile", "auto"),
+                        cache=self.model_cache,
+                    )
             self._invoker.invoke(self._on_model_loaded)
         except Exception as e:
             err = e
             self._invoker.invoke(lambda: self._on_model_error(err))
 
+    def _connect_model_server(self):
+        """Use a running ``whispertype serve`` daemon if it has our model."""
+        from voice_app.services.model_server import RemoteTranscriber
+
+        remote = RemoteTranscriber(self.config.get("model_server_socket"))
+        try:
+            remote.load_model(
+                model_name=self.config["model"],
+                model_path=self.config.get("model_path"),
+                compute_type=self.config.get("compute_type", "int8"),
+                profile=self.config.get("decode_profile", "auto"),
+                cache=self.model_cache,
+            )
+        except ConnectionError as e:
+            print(f"Model server unavailable, loading locally: {e}", file=sys.stderr)
+            return False
+        self.transcriber = remote
+        return True
+
     def _on_model_loaded(self):
         self.state = "idle"
         self.window.set_state("idle")
         self._register_hotkey()
+        self._update_model_menu()
+        self.settings.watch(
+            lambda cfg, changed: self._invoker.invoke(lambda: self._on_config_changed(cfg, changed)))
+        _startup_mark("ready")
+        if _STARTUP_TRACE == "exit":
+            QTimer.singleShot(0, self.app.quit)
+        elif self.config.get("refine_model"):
+            threading.Thread(target=self._load_refine_model, daemon=True).start()
+
+    def _load_refine_model(self):
+        """Load the second-tier model once the draft model is already serving."""
+        from voice_app.services.transcriber import Transcriber
+
+        refiner = Transcriber()
+        try:
+            with tracer.span("model.load.refine"):
+                refiner.load_model(
+                    model_name=self.config["refine_model"],
+                    compute_type=self.config.get("compute_type", "int8"),
+                    profile=self.config.get("refine_profile", "accurate"),
+                    cache=self.model_cache,
+                )
+        except Exception as e:
+            print(f"Refine model load error: {e}", file=sys.stderr)
+            return
+        self.refiner = refiner
 
     def _on_model_error(self, error):
         print(f"Model load error: {error}", file=sys.stderr)
         self.state = "idle"
         self.window.set_state("error")
+        _startup_mark("error")
+        if _STARTUP_TRACE == "exit":
+            QTimer.singleShot(0, lambda: self.app.exit(1))
+
+    # -- Model switching -----------------------------------------------
+
+    def switch_model(self, model_name=None, compute_type=None):
+        """Load another model (or compute type) in the background and swap it in.
+
+        Dictation keeps using the current model until the new one is ready.
+        Returns False if nothing changes or a switch is already running.
+        """
+        if self.transcriber is None or self.state == "loading" or self._switching:
+            return False
+        model_path = None if model_name else self.config.get("model_path")
+        model_name = model_name or self.config["model"]
+        compute_type = compute_type or self.config.get("compute_type", "int8")
+        return self._start_switch(model_name, model_path, compute_type)
+
+    def _start_switch(self, model_name, model_path, compute_type):
+        current = (self.config["model"], self.config.get("model_path") or None,
+                   self.config.get("compute_type", "int8"))
+        if (model_name, model_path, compute_type) == current:
+            return False
+
+        self._switching = model_name if model_name != current[0] else compute_type
+        self._update_model_menu()
+        threading.Thread(target=self._do_switch_model, daemon=True,
+                         args=(model_name, model_path, compute_type)).start()
+        return True
+
+    def _do_switch_model(self, model_name, model_path, compute_type):
+        from voice_app.services.transcriber import Transcriber
+
+        target = self.transcriber
+        if not isinstance(target, Transcriber):
+            # Served by the model daemon, which only has its own model.
+            target = Transcriber()
+        try:
+            with tracer.span("model.switch"):
+                target.load_model(
+                    model_name=model_name,
+                    model_path=model_path,
+                    compute_type=compute_type,
+                    profile=self.config.get("decode_profile", "auto"),
+                    cache=self.model_cache,
+                )
+        except Exception as e:
+            err = e
+            self._invoker.invoke(lambda: self._on_model_switch_error(model_name, err))
+            return
+        self._invoker.invoke(
+            lambda: self._on_model_switched(target, model_name, model_path, compute_type))
+
+    def _on_model_switched(self, transcriber, model_name, model_path, compute_type):
+        # In-flight decodes hold their own reference to the previous model;
+        # it is freed once they finish.
+        self.transcriber = transcriber
+        self._switching = None
+        self.config["model"] = model_name
+        self.config["model_path"] = model_path
+        self.config["compute_type"] = compute_type
+        self.settings.save_config(self.config)
+        self._update_model_menu()
+        print(f"Switched to model {model_name} ({compute_type})", file=sys.stderr)
+        self._run_queued_switch()
+
+    def _on_model_switch_error(self, model_name, error):
+        print(f"Model switch to {model_name} failed: {error}", file=sys.stderr)
+        self._switching = None
+        self._update_model_menu()
+        self._run_queued_switch()
+
+    def _run_queued_switch(self):
+        """Apply a model edit from config.json that arrived mid-switch."""
+        target, self._switch_queued = self._switch_queued, None
+        if target is not None:
+            self._start_switch(*target)
+
+    def _update_model_menu(self):
+        self.window.set_model_menu(
+            self.config.get("model_choices", ()),
+            self.config.get("compute_type_choices", ()),
+            (self.config["model"], self.config.get("compute_type", "int8")),
+            pending=self._switching,
+        )
+
+    # -- Config hot reload ---------------------------------------------
+
+    def _on_config_changed(self, cfg, changed):
+        """Apply edits made to config.json while the app is running."""
+        restart = changed & RESTART_KEYS
+        if restart:
+            print(f"[WhisperType] Restart to apply: {', '.join(sorted(restart))}",
+                  file=sys.stderr)
+        old_hotkey = self.config["hotkey"]
+        model_keys = {"model", "model_path", "compute_type"}
+        # Restart-only keys are stored too, so saving the config (e.g. after
+        # a tray model switch) keeps the edit on disk.
+        for key in changed - model_keys:
+            self.config[key] = cfg.get(key)
+
+        if "hotkey" in changed and self.hotkey_mgr is not None:
+            # Bind the new hotkey before dropping the old one, so a bad
+            # string leaves the working binding in place.
+            try:
+                self.hotkey_mgr.register(self.config["hotkey"], self._on_hotkey, suppress=True)
+            except Exception as e:
+                print(f"[WhisperType] Invalid hotkey {self.config['hotkey']!r}, keeping "
+                      f"{old_hotkey!r}: {e}", file=sys.stderr)
+                self.config["hotkey"] = old_hotkey
+            else:
+                if self.config["hotkey"] != old_hotkey:
+                    self.hotkey_mgr.unregister(old_hotkey)
+        if "warm_capture" in changed:
+            # Switching capture mode mid-recording would cut it off; wait.
+            self._warm_pending = True
+            if self.state != "recording":
+                self._apply_warm_capture()
+        if changed & model_keys:
+            # The whole model triple from disk, so editing compute_type alone
+            # keeps model_path.
+            target = (cfg.get("model", self.config["model"]), cfg.get("model_path") or None,
+                      cfg.get("compute_type", "int8"))
+            if self._switching:
+                self._switch_queued = target
+                print("[WhisperType] Model switch in progress; applying the edited model "
+                      "when it finishes", file=sys.stderr)
+            else:
+                self._start_switch(*target)
+        if changed & {"model_choices", "compute_type_choices"}:
+            self._update_model_menu()
+        print(f"Reloaded config: {', '.join(sorted(changed))}", file=sys.stderr)
+
+    def _apply_warm_capture(self):
+        """Bring the recorder in line with the ``warm_capture`` setting."""
+        if not self._warm_pending:
+            return
+        self._warm_pending = False
+        if self.config.get("warm_capture"):
+            try:
+                self.recorder.keep_warm()
+            except Exception as e:
+                print(f"Mic error, using on-demand capture: {e}", file=sys.stderr)
+        else:
+            self.recorder.close()
 
     # -- Hotkeys -------------------------------------------------------
 
@@ -97,6 +375,9 @@ class OverlayApp:
     # -- Button callbacks ----------------------------------------------
 
     def _on_button_click(self):
+        if self._pending_correction and self.window.state == "correction":
+            self._apply_correction()
+            return
         self._toggle_recording()
 
     def _on_stop_click(self):
@@ -108,31 +389,67 @@ class OverlayApp:
             self._cancel_recording()
 
     def _on_drag_end(self, x, y):
-        save_position(x, y)
+        self.settings.save_position(x, y)
 
     # -- Recording control ---------------------------------------------
 
     def _toggle_recording(self):
+        # Earlier dictations may still be decoding; that never blocks a new one.
         if self.state == "idle":
             self._start_recording()
         elif self.state == "recording":
             self._stop_recording()
 
     def _start_recording(self):
-        self.focus_mgr.save_focus()
+        self._stages = tracer.stages()
+        self._stages.mark("start")
+        self._pending_correction = None
+        self._refine_gen += 1
+        # Start capturing before the (possibly slow) focus query so the first
+        # syllable isn't lost.
         try:
-            self.recorder.start()
+            with tracer.span("recorder.start"):
+                self.recorder.start()
         except Exception as e:
             print(f"Mic error: {e}", file=sys.stderr)
+            self._stages.mark("idle")
             self.state = "idle"
-            self.window.set_state("error")
+            self._show_result("error")
             return
+        self._recording_focus = self.focus_mgr.save_focus()
+        self._stages.mark("recording")
         self.state = "recording"
         self.window.set_state("recording")
+        if self.config.get("streaming"):
+            self._start_streaming()
         if self.config["sound_feedback"]:
             self.sound.beep(800, 100)
         self._poll_silence()
 
+    def _start_streaming(self):
+        from voice_app.services import streaming
+
+        window, on_update = streaming.WINDOW_SECONDS, None
+        # Type as we go only when nothing earlier is still waiting to be
+        # pasted, so text always lands in dictation order.
+        if self.config.get("live_typing") and not self._outstanding:
+            from voice_app.services.text_injector import LiveInjection
+
+            live = self._live = LiveInjection(
+                prefix=" " if self.config.get("prepend_space") else "")
+            window = streaming.LIVE_WINDOW_SECONDS
+
+            def on_update(committed, tentative):
+                self._invoker.invoke(lambda: live.update(committed, tentative))
+
+        self._stream_session = streaming.StreamingTranscriber(
+            self.transcriber, self.recorder,
+            language=self.config.get("language") or None,
+            initial_prompt=self.config.get("initial_prompt") or None,
+            window=window, on_update=on_update,
+        )
+        self._stream_session.start()
+
     def _poll_silence(self):
         if self.state != "recording":
             return
@@ -143,87 +460,268 @@ class OverlayApp:
         QTimer.singleShot(250, self._poll_silence)
 
     def _stop_recording(self):
-        audio = self.recorder.stop()
+        with tracer.span("recorder.stop"):
+            audio = self.recorder.stop()
+        self._stages.mark("stopped")
+        session, self._stream_session = self._stream_session, None
+        live, self._live = self._live, None
+        if session is not None:
+            # The recorder may be restarted before this job is decoded.
+            session.stop()
         if self.config["sound_feedback"]:
             self.sound.beep(400, 150)
+        self.state = "idle"
+        self._apply_warm_capture()
 
         if audio is None:
-            self.state = "idle"
-            self.window.set_state("too_short")
+            if session is not None:
+                session.cancel()
+            if live is not None:
+                live.cancel()
+            self._stages.mark("idle")
+            self._show_result("too_short")
             return
 
-        self.state = "transcribing"
+        self.jobs.submit(
+            audio, session=session, focus=self._recording_focus,
+            language=self.config.get("language") or None,
+            initial_prompt=self.config.get("initial_prompt") or None,
+            live=live, stages=self._stages,
+        )
+        self._outstanding += 1
+        self.window.set_queue_depth(self._outstanding)
         self.window.set_state("transcribing")
 
-        lang = self.config.get("language") or None
-        prompt = self.config.get("initial_prompt") or None
-        t = threading.Thread(target=self._do_transcribe, args=(audio, lang, prompt), daemon=True)
-        t.start()
-
     def _cancel_recording(self):
         self.recorder.stop()
+        if self._stream_session is not None:
+            self._stream_session.cancel()
+            self._stream_session = None
+        if self._live is not None:
+            self._live.cancel()
+            self._live = None
+        self._stages.mark("idle")
         self.state = "idle"
-        self.window.set_state("idle")
+        self._apply_warm_capture()
+        self._show_result("idle")
         if self.config["sound_feedback"]:
-            def _cancel_beeps():
-                self.sound.beep(300, 80)
-                time.sleep(0.05)
-                self.sound.beep(300, 80)
-            threading.Thread(target=_cancel_beeps, daemon=True).start()
+            self.sound.beep(300, 80)
+            self.sound.beep(300, 80, delay_ms=130)
+
+    def _show_result(self, state, text=""):
+        """Show *state* unless recording, or the spinner while jobs remain."""
+        if self.state == "recording":
+            return
+        if self._outstanding:
+            self.window.set_state("transcribing")
+        else:
+            self.window.set_state(state, text=text)
 
     # -- Transcription -------------------------------------------------
 
-    def _do_transcribe(self, audio, language, initial_prompt):
+    def _transcribe_job(self, job):
+        """Runs on the job queue's worker; returns the text or None."""
+        audio, session = job.audio, job.session
+        if self.config.get("vad_trim", True):
+            with tracer.span("vad.trim"):
+                audio = self._trim_silence(audio, keep_start=session is not None)
+            if audio is None:
+                if session is not None:
+                    session.cancel()
+                return None
+            job.audio = audio
+        job.stages.mark("transcribing")
+        with tracer.span("transcribe"):
+            if session is not None:
+                return session.finish(audio)
+            return self.transcriber.transcribe(audio, language=job.language,
+                                               initial_prompt=job.initial_prompt)
+
+    def _on_job_decoded(self, job):
+        self._invoker.invoke(lambda: self._on_transcription_done(job))
+
+    def _trim_silence(self, audio, keep_start=False):
+        """Cut leading/trailing silence; None if a short buffer has no speech.
+
+        A streaming session has already indexed into the buffer, so only the
+        trailing silence is dropped for it.  Longer buffers where the VAD
+        finds nothing are decoded untrimmed rather than dropped.
+        """
+        from voice_app.services.vad import speech_bounds
+
         try:
-            text = self.transcriber.transcribe(audio, language=language, initial_prompt=initial_prompt)
-            self._invoker.invoke(lambda: self._on_transcription_done(text))
+            bounds = speech_bounds(audio, self.recorder.vad)
         except Exception as e:
-            self._invoker.invoke(lambda: self._on_transcription_error(e))
+            print(f"VAD error: {e}", file=sys.stderr)
+            return audio
+        if bounds is None:
+            if len(audio) >= UNTRIMMED_MIN_SECONDS * self.recorder.sample_rate:
+                return audio
+            return None
+        start, end = bounds
+        return audio[0 if keep_start else start:end]
+
+    def _on_transcription_done(self, job):
+        job.stages.mark("transcribed")
+        self._paste_queue.append(job)
+        self._paste_next()
+
+    def _paste_next(self):
+        """Inject finished jobs one at a time, in the order they were recorded."""
+        while self._paste_queue and not self._pasting:
+            job = self._paste_queue.popleft()
+            if job.error is not None:
+                print(f"Transcription error: {job.error}", file=sys.stderr)
+                self._finish_job(job, "error")
+            elif not job.text and not (job.live and job.live.typed):
+                self._finish_job(job, "too_short" if job.text is None else "idle")
+            else:
+                self._pasting = True
+                self.focus_mgr.restore_focus(job.focus)
+                self._after_focus(job.focus, lambda j=job: self._do_paste(j))
+
+    def _after_focus(self, target, callback):
+        """Run *callback* once *target* has focus, polling on a Qt timer."""
+        wait = self.focus_mgr.focus_wait
+        start = time.perf_counter()
+
+        def poll():
+            focused = self.focus_mgr.is_focused(target)
+            elapsed = time.perf_counter() - start
+            if focused is None:
+                # Can't be checked here: give the switch the full timeout.
+                remaining = max(0.0, wait.timeout - elapsed)
+                QTimer.singleShot(int(remaining * 1000), callback)
+            elif focused or elapsed >= wait.timeout:
+                wait.record(elapsed, focused)
+                callback()
+            else:
+                QTimer.singleShot(10, poll)
+        poll()
+
+    def _finish_job(self, job, state, text=""):
+        self._outstanding -= 1
+        self.window.set_queue_depth(self._outstanding)
+        job.stages.mark("idle")
+        self._show_result(state, text)
+
+    def _do_paste(self, job):
+        text = job.text or ""
+        if self.config.get("prepend_space") and text:
+            text = " " + text
 
-    def _on_transcription_done(self, text):
-        if text:
-            self.focus_mgr.restore_focus()
-            QTimer.singleShot(300, lambda: self._do_paste(text))
+        from voice_app.services.text_injector import get_worker
+
+        # Everything below only queues work: the keystrokes and clipboard
+        # juggling run on the injection worker, and the UI stays live.
+        job.stages.mark("pasting")
+        worker = get_worker()
+        worker.submit(self._mute_hotkeys)
+        if job.live is not None:
+            # Most of it is already typed; fix up the tail.
+            job.live.finish(text)
         else:
-            self.state = "idle"
-            self.window.set_state("idle")
+            window_id = job.focus.window_id if job.focus else self.focus_mgr.saved_hwnd
+            worker.paste(text, target_hwnd=window_id)
+        worker.submit(self._unmute_hotkeys,
+                      on_done=lambda: self._invoker.invoke(lambda: self._on_pasted(job, text)))
+
+    def _mute_hotkeys(self):
+        with tracer.span("hotkey.mute"):
+            self.hotkey_mgr.mute()
+
+    def _unmute_hotkeys(self):
+        with tracer.span("hotkey.unmute"):
+            self.hotkey_mgr.unmute()
+
+    def _on_pasted(self, job, text):
+        self._pasting = False
+        if self.state == "recording" and self._recording_focus != job.focus:
+            # Hand focus back to where the current dictation will go.
+            self.focus_mgr.restore_focus(self._recording_focus)
+        self._finish_job(job, "preview" if text else "idle", text=text.strip())
+
+        if text and self.refiner is not None and self.state == "idle" and not self._outstanding:
+            gen = self._refine_gen
+            threading.Thread(target=self._do_refine, args=(gen, text, job),
+                             daemon=True).start()
+        self._paste_next()
+
+    # -- Refinement ----------------------------------------------------
+
+    def _do_refine(self, gen, pasted, job):
+        try:
+            with tracer.span("refine"):
+                refined = self.refiner.transcribe(job.audio, language=job.language,
+                                                  initial_prompt=job.initial_prompt)
+        except Exception as e:
+            print(f"Refine error: {e}", file=sys.stderr)
+            return
+        self._invoker.invoke(lambda: self._on_refine_done(gen, pasted, refined, job.focus))
 
-    def _do_paste(self, text):
+    def _on_refine_done(self, gen, pasted, refined, focus):
+        # A newer dictation has started, or the user is busy — drop it.
+        if (gen != self._refine_gen or self.state != "idle" or self._outstanding
+                or not refined):
+            return
         if self.config.get("prepend_space"):
-            text = " " + text
+            refined = " " + refined
+        if refined.split() == pasted.split():
+            return
+        self._pending_correction = (pasted, refined, focus)
+        self.window.set_state("correction", text=refined.strip())
 
-        self.hotkey_mgr.unregister_all()
-        try:
-            inject_text(text, target_hwnd=self.focus_mgr.saved_hwnd)
-        finally:
-            self._register_hotkey()
+    def _apply_correction(self):
+        from voice_app.services.text_injector import get_worker
 
-        self.state = "idle"
-        self.window.set_state("preview", text=text.strip())
+        pasted, refined, focus = self._pending_correction
+        self._pending_correction = None
+        self.window.set_state("idle")
+        self.focus_mgr.restore_focus(focus)
 
-    def _on_transcription_error(self, error):
-        print(f"Transcription error: {error}", file=sys.stderr)
-        self.state = "idle"
-        self.window.set_state("error")
+        def _replace():
+            worker = get_worker()
+            worker.submit(self._mute_hotkeys)
+            worker.replace(pasted, refined, target_hwnd=focus.window_id)
+            worker.submit(self._unmute_hotkeys)
+        self._after_focus(focus, _replace)
 
     # -- Run -----------------------------------------------------------
 
     def run(self):
         try:
-            self.app.exec()
+            return self.app.exec()
         finally:
-            self.hotkey_mgr.unregister_all()
+            if self.jobs is not None:
+                self.jobs.close()
+            from voice_app.services.text_injector import close_worker
+            close_worker()
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.hotkey_mgr is not None:
+                self.hotkey_mgr.unregister_all()
+                self.hotkey_mgr.stop_listener()
+            self.settings.close()
+            tracer.close()
 
 
 def main():
-    config = load_config()
+    _startup_mark("main")
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from voice_app.services.model_server import serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "transcribe":
+        from voice_app.batch import transcribe_main
+        sys.exit(transcribe_main(sys.argv[2:]))
+
+    config = get_store().load_config()
 
     # CLI arg overrides model
     if len(sys.argv) > 1:
         config["model"] = sys.argv[1]
 
     app = OverlayApp(config)
-    app.run()
+    sys.exit(app.run())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""Preallocated capture buffer shared between the audio callback and readers.
+
+The PortAudio callback is the only writer.  It copies each block straight
+into a preallocated array and then publishes the new write index; readers
+(``stop()``, the streaming transcriber, VAD) only ever look at samples below
+that index, so no lock is needed on either side.  Views handed out are
+zero-copy slices of the arena.
+"""
+
+import numpy as np
+
+# Initial arena size — 30 s of 16 kHz audio (~2 MB of float32).
+DEFAULT_CAPACITY = 16000 * 30
+
+
+class AudioBuffer:
+    """Growable single-producer arena of mono samples."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, dtype=np.float32):
+        self._initial_capacity = capacity
+        self.dtype = np.dtype(dtype)
+        self._data = np.empty(capacity, dtype=self.dtype)
+        self._write_idx = 0
+        self._exported = False
+
+    def reset(self):
+        """Start a new recording.
+
+        The arena is reused unless a view of it was handed out, in which case
+        a fresh one is allocated so the old view stays valid.
+        """
+        if self._exported or len(self._data) > self._initial_capacity * 4:
+            self._data = np.empty(self._initial_capacity, dtype=self.dtype)
+            self._exported = False
+        self._write_idx = 0
+
+    def write(self, samples):
+        """Append *samples* (1-D).  Must only be called from the producer."""
+        n = len(samples)
+        idx = self._write_idx
+        if idx + n > len(self._data):
+            self._grow(idx + n)
+        self._data[idx:idx + n] = samples
+        # Publish only after the samples are in place.
+        self._write_idx = idx + n
+
+    def _grow(self, needed):
+        capacity = len(self._data)
+        while capacity < needed:
+            capacity *= 2
+        data = np.empty(capacity, dtype=self.dtype)
+        data[:self._write_idx] = self._data[:self._write_idx]
+        # Readers holding the old array keep a valid copy of their range.
+        self._data = data
+
+    def view(self, start=0, end=None):
+        """Return a zero-copy view of samples ``[start, end)``.
+
+        Safe to call from any thread while the producer is writing.
+        """
+        # Read the index before the array: after a grow the old array may not
+        # hold newly published samples, but the new one always holds the old.
+        idx = self._write_idx
+        data = self._data
+        if end is None or end > idx:
+            end = idx
+        self._exported = True
+        return data[start:end]
+
+    def __len__(self):
+        return self._write_idx
+
+
+class RingBuffer:
+    """Fixed-size ring keeping the most recent samples (single-threaded)."""
+
+    def __init__(self, capacity, dtype=np.float32):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._write_idx = 0
+        self._filled = 0
+
+    def write(self, samples):
+        capacity = len(self._data)
+        if capacity == 0:
+            return
+        samples = samples[-capacity:]
+        n = len(samples)
+        idx = self._write_idx
+        first = min(n, capacity - idx)
+        self._data[idx:idx + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        self._write_idx = (idx + n) % capacity
+        self._filled = min(capacity, self._filled + n)
+
+    def read(self):
+        """Return the buffered samples, oldest first, as a new array."""
+        if self._filled < len(self._data):
+            return self._data[:self._filled].copy()
+        return np.concatenate((self._data[self._write_idx:], self._data[:self._write_idx]))
+
+    def clear(self):
+        self._write_idx = 0
+        self._filled = 0
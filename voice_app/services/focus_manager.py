@@ -1,17 +1,44 @@
 """Thin facade — delegates to the platform-specific focus manager."""
 
+from collections import namedtuple
+
 from voice_app.services.platform import get_focus_manager
+from voice_app.services.platform._wait import waiter
+from voice_app.services.tracing import tracer
+
+# A saved focus target: the platform's restore token and the window id that
+# text injection expects.
+FocusTarget = namedtuple("FocusTarget", ["token", "window_id"])
 
 
 class FocusManager:
     def __init__(self):
         self._impl = get_focus_manager()
+        # Window managers switch focus asynchronously; callers poll
+        # is_focused() until this waiter's (adaptive) timeout.
+        self.focus_wait = waiter("focus", floor=0.05, ceiling=0.3)
 
     def save_focus(self):
-        self._impl.save_focus()
+        """Save the focused window and return it as a :class:`FocusTarget`."""
+        with tracer.span("focus.save"):
+            self._impl.save_focus()
+        return FocusTarget(self._impl.focus_token(), self._impl.saved_window_id)
+
+    def restore_focus(self, target=None):
+        """Re-activate *target*, or the most recently saved window."""
+        with tracer.span("focus.restore"):
+            if target is None:
+                return self._impl.restore_focus()
+            return self._impl.restore_token(target.token)
 
-    def restore_focus(self):
-        return self._impl.restore_focus()
+    def is_focused(self, target):
+        """True once *target* is the focused window; None if that can't be checked."""
+        if target is None or target.window_id is None:
+            return None
+        active = self._impl.active_window_id()
+        if active is None:
+            return None
+        return active == target.window_id
 
     @property
     def saved_hwnd(self):
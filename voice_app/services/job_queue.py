@@ -0,0 +1,71 @@
+"""Ordered queue of stopped recordings waiting to be transcribed.
+
+Recording can restart as soon as the previous one stops: every stopped
+recording becomes a :class:`TranscriptionJob`, and a single worker thread
+decodes them in submission order, so results come back in the order they
+were spoken.
+"""
+
+import itertools
+import queue
+import threading
+
+from voice_app.services.tracing import tracer
+
+_STOP = object()
+
+
+class TranscriptionJob:
+    """One recording plus everything needed to decode and deliver it."""
+
+    def __init__(self, seq, audio, session=None, focus=None, language=None,
+                 initial_prompt=None, live=None, stages=None):
+        self.seq = seq
+        self.audio = audio
+        self.session = session  # StreamingTranscriber, if one ran
+        self.focus = focus      # FocusTarget saved when recording started
+        self.language = language
+        self.initial_prompt = initial_prompt
+        self.live = live        # LiveInjection that already typed part of it
+        # StageClock started when recording began.
+        self.stages = stages if stages is not None else tracer.stages()
+        self.text = None        # None when there was no speech
+        self.error = None
+
+
+class TranscriptionQueue:
+    """Decode jobs one at a time on a background thread.
+
+    *process(job)* returns the job's text (or None) and runs on the worker;
+    *on_done(job)* is then called on the worker with ``text``/``error`` set.
+    """
+
+    def __init__(self, process, on_done):
+        self._process = process
+        self._on_done = on_done
+        self._jobs = queue.Queue()
+        self._seq = itertools.count(1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, audio, session=None, focus=None, language=None, initial_prompt=None,
+               live=None, stages=None):
+        job = TranscriptionJob(next(self._seq), audio, session=session, focus=focus,
+                               language=language, initial_prompt=initial_prompt, live=live,
+                               stages=stages)
+        self._jobs.put(job)
+        return job
+
+    def close(self):
+        self._jobs.put(_STOP)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            try:
+                job.text = self._process(job)
+            except Exception as e:
+                job.error = e
+            self._on_done(job)
@@ -0,0 +1,109 @@
+"""Input level and band energies for the recording overlay.
+
+Fed from the audio callback, so :meth:`LevelMeter.feed` allocates no arrays:
+samples are gathered into a preallocated frame, and each full frame is
+windowed, projected onto a precomputed DFT basis and summed into
+log-spaced bands with ``out=`` matmuls.  Results go into one of three
+preallocated slots and are published by switching an index, so the UI
+thread reads the latest frame without a lock.
+"""
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+N_BANDS = 32
+# Samples per analysis frame (32 ms at 16 kHz), i.e. ~31 updates a second.
+FRAME = 512
+LOW_HZ = 80.0
+# Band energies map dBFS [FLOOR_DB, CEIL_DB] onto [0, 1] for display.
+FLOOR_DB = -75.0
+CEIL_DB = -15.0
+_SLOTS = 3
+
+
+def _band_matrix(bin_freqs, n_bands, low, high):
+    """Return a ``(bins, bands)`` matrix averaging bins into log-spaced bands."""
+    edges = np.geomspace(low, high, n_bands + 1)
+    m = np.zeros((len(bin_freqs), n_bands), dtype=np.float32)
+    for b in range(n_bands):
+        idx = np.flatnonzero((bin_freqs >= edges[b]) & (bin_freqs < edges[b + 1]))
+        if len(idx) == 0:
+            # Narrower than one bin at the low end: use the nearest bin.
+            idx = [np.abs(bin_freqs - np.sqrt(edges[b] * edges[b + 1])).argmin()]
+        m[idx, b] = 1.0 / len(idx)
+    return m
+
+
+class LevelMeter:
+    """Single-producer meter: ``feed()`` from the audio callback, ``read()`` anywhere."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, n_bands=N_BANDS, frame=FRAME):
+        self.n_bands = n_bands
+        n = np.arange(frame)
+        bins = np.arange(1, frame // 2 + 1)
+        window = np.hanning(frame)
+        # Scaled so a full-scale sine reads 0 dBFS in its band.
+        angle = 2 * np.pi * np.outer(n, bins) / frame
+        basis = np.hstack((np.cos(angle), np.sin(angle))) * (window * 2 / window.sum())[:, None]
+        self._basis = np.ascontiguousarray(basis, dtype=np.float32)
+        self._bands = _band_matrix(bins * sample_rate / frame, n_bands,
+                                   LOW_HZ, sample_rate / 2)
+
+        self._frame = np.zeros(frame, dtype=np.float32)
+        self._fill = 0
+        self._spectrum = np.zeros(2 * len(bins), dtype=np.float32)
+        self._power = np.zeros(len(bins), dtype=np.float32)
+        self._slots = np.zeros((_SLOTS, n_bands), dtype=np.float32)
+        self._levels = [0.0] * _SLOTS
+        self._front = 0
+        self.frames = 0  # frames published since reset()
+
+    def reset(self):
+        self._fill = 0
+        self._slots.fill(0.0)
+        self._levels = [0.0] * _SLOTS
+        self.frames = 0
+
+    def feed(self, block):
+        """Add mono float32 samples; analyses every complete frame."""
+        frame = self._frame
+        size = len(frame)
+        pos = 0
+        n = len(block)
+        while pos < n:
+            take = min(size - self._fill, n - pos)
+            frame[self._fill:self._fill + take] = block[pos:pos + take]
+            self._fill += take
+            pos += take
+            if self._fill == size:
+                self._analyse()
+                self._fill = 0
+
+    def _analyse(self):
+        k = len(self._power)
+        spec = self._spectrum
+        np.matmul(self._frame, self._basis, out=spec)
+        np.multiply(spec, spec, out=spec)
+        np.add(spec[:k], spec[k:], out=self._power)
+
+        slot = (self._front + 1) % _SLOTS
+        out = self._slots[slot]
+        np.matmul(self._power, self._bands, out=out)
+        np.maximum(out, 1e-12, out=out)
+        np.log10(out, out=out)
+        # 10*log10(p) dB -> [0, 1] over the display range.
+        np.multiply(out, 10.0 / (CEIL_DB - FLOOR_DB), out=out)
+        np.subtract(out, FLOOR_DB / (CEIL_DB - FLOOR_DB), out=out)
+        np.clip(out, 0.0, 1.0, out=out)
+
+        rms_db = 10.0 * np.log10(float(np.dot(self._frame, self._frame)) / len(self._frame) + 1e-12)
+        self._levels[slot] = min(1.0, max(0.0, (rms_db - FLOOR_DB) / (CEIL_DB - FLOOR_DB)))
+        self._front = slot
+        self.frames += 1
+
+    def read(self, out=None):
+        """Copy the latest band energies (0..1) into *out*; returns the overall level (0..1)."""
+        slot = self._front
+        if out is not None:
+            out[:] = self._slots[slot]
+        return self._levels[slot]
@@ -0,0 +1,246 @@
+"""Local cache of converted CTranslate2 Whisper models.
+
+Each model lives in a versioned directory with a manifest recording every
+file's size and SHA-256 plus the compute type it was last loaded with:
+
+    <cache>/v1/base/model.bin, config.json, tokenizer.json, ...
+    <cache>/v1/base/manifest.json
+
+Resolution never needs the network if the model was seen before — either in
+this cache or in the Hugging Face cache, which is imported on first use.
+Launches only check file sizes; after the model has loaded a background
+check re-hashes only files whose size or mtime changed since they were last
+verified, and a corrupt entry is re-fetched next time.
+
+CTranslate2 reads weights into its own buffers rather than mapping them, so
+the cache makes loads fast by paging the files into the OS page cache on a
+background thread (``prefetch``) before ``WhisperModel`` reads them.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+import threading
+import time
+
+CACHE_FORMAT = 1
+MANIFEST = "manifest.json"
+_CHUNK = 1 << 20
+
+
+def _cache_dir():
+    """Return the platform-appropriate user cache directory for WhisperType."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+        return os.path.join(base, "WhisperType", "Cache")
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~"), "Library", "Caches", "WhisperType")
+    xdg = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(xdg, "whispertype")
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                return h.hexdigest()
+            h.update(chunk)
+
+
+def _model_files(directory):
+    return sorted(
+        name for name in os.listdir(directory)
+        if name != MANIFEST and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def prefetch(directory):
+    """Page every file in *directory* into the OS page cache.
+
+    Uses ``posix_fadvise``/``madvise`` hints where available and falls back
+    to touching one byte per page through a read-only mapping.
+    """
+    for name in _model_files(directory):
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    continue
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                    continue
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+                        mm.madvise(mmap.MADV_WILLNEED)
+                    else:
+                        for offset in range(0, size, mmap.PAGESIZE):
+                            mm[offset]
+        except (OSError, ValueError) as e:
+            print(f"[WhisperType] Prefetch failed for {path}: {e}", file=sys.stderr)
+
+
+class ModelCache:
+    def __init__(self, root=None):
+        self.root = os.path.join(root or _cache_dir(), f"v{CACHE_FORMAT}")
+
+    def entry_dir(self, model_name):
+        # Hub ids ("org/model") become a single directory level.
+        return os.path.join(self.root, model_name.replace("/", "--"))
+
+    # -- Manifest ------------------------------------------------------
+
+    def read_manifest(self, model_name):
+        path = os.path.join(self.entry_dir(model_name), MANIFEST)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("format") != CACHE_FORMAT:
+            return None
+        return manifest
+
+    def _write_manifest(self, directory, manifest):
+        tmp = os.path.join(directory, MANIFEST + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, os.path.join(directory, MANIFEST))
+
+    def is_cached(self, model_name):
+        """Quick integrity check: manifest present and every file the right size."""
+        manifest = self.read_manifest(model_name)
+        if manifest is None:
+            return False
+        directory = self.entry_dir(model_name)
+        for name, info in manifest["files"].items():
+            try:
+                if os.path.getsize(os.path.join(directory, name)) != info["size"]:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    # -- Resolution ----------------------------------------------------
+
+    def resolve(self, model_name, compute_type="int8"):
+        """Return a local directory holding *model_name*, populating the cache if needed."""
+        directory = self.entry_dir(model_name)
+        if not self.is_cached(model_name):
+            self._populate(model_name, compute_type)
+        else:
+            manifest = self.read_manifest(model_name)
+            if manifest.get("compute_type") != compute_type:
+                manifest["compute_type"] = compute_type
+                self._write_manifest(directory, manifest)
+        return directory
+
+    def _populate(self, model_name, compute_type):
+        from faster_whisper.utils import download_model
+
+        final = self.entry_dir(model_name)
+        source = None
+        # Already in the Hugging Face cache? Then no network is needed.  Not
+        # after a failed verify, though: the entry was hard-linked from there.
+        if not os.path.exists(os.path.join(final, MANIFEST + ".bad")):
+            try:
+                source = download_model(model_name, local_files_only=True)
+            except Exception:
+                source = None
+
+        staging = f"{final}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        try:
+            if source is not None:
+                for name in _model_files(source):
+                    self._link_or_copy(os.path.join(source, name), os.path.join(staging, name))
+            else:
+                download_model(model_name, output_dir=staging)
+
+            files = {}
+            for name in _model_files(staging):
+                path = os.path.join(staging, name)
+                st = os.stat(path)
+                files[name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                               "sha256": _sha256(path)}
+            self._write_manifest(staging, {
+                "format": CACHE_FORMAT,
+                "model": model_name,
+                "compute_type": compute_type,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "files": files,
+            })
+            shutil.rmtree(final, ignore_errors=True)
+            os.replace(staging, final)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @staticmethod
+    def _link_or_copy(src, dst):
+        src = os.path.realpath(src)  # HF snapshots are symlinks into blobs/
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    # -- Verification and warm-up --------------------------------------
+
+    def verify(self, model_name, force=False):
+        """Check files against the manifest.  Invalidates the entry on mismatch.
+
+        Only files whose size or mtime changed since they were last verified
+        are hashed, unless *force* is set.
+        """
+        manifest = self.read_manifest(model_name)
+        if manifest is None:
+            return False
+        directory = self.entry_dir(model_name)
+        updated = False
+        for name, info in manifest["files"].items():
+            path = os.path.join(directory, name)
+            try:
+                st = os.stat(path)
+                if (not force and st.st_size == info["size"]
+                        and st.st_mtime_ns == info.get("mtime_ns")):
+                    continue
+                ok = st.st_size == info["size"] and _sha256(path) == info["sha256"]
+            except OSError:
+                ok = False
+            if ok and info.get("mtime_ns") != st.st_mtime_ns:
+                info["mtime_ns"] = st.st_mtime_ns
+                updated = True
+            if not ok:
+                print(f"[WhisperType] Cached model {model_name!r} is corrupt ({name}); "
+                      "it will be fetched again on next load.", file=sys.stderr)
+                os.replace(os.path.join(directory, MANIFEST),
+                           os.path.join(directory, MANIFEST + ".bad"))
+                return False
+        if updated:
+            try:
+                self._write_manifest(directory, manifest)
+            except OSError:
+                pass
+        return True
+
+    def verify_async(self, model_name):
+        threading.Thread(target=self.verify, args=(model_name,), daemon=True).start()
+
+    def prefetch_async(self, model_name):
+        """Warm the page cache for an already-cached model in the background."""
+        if not self.is_cached(model_name):
+            return
+        directory = self.entry_dir(model_name)
+        threading.Thread(target=prefetch, args=(directory,), daemon=True).start()
+
+
+def get_model_cache(config):
+    """Return the configured :class:`ModelCache`, or None if disabled."""
+    if not config.get("model_cache", True):
+        return None
+    return ModelCache(config.get("model_cache_dir"))
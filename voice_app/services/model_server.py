@@ -0,0 +1,363 @@
+"""Shared model server — one warm WhisperModel serving many overlays.
+
+Run ``whispertype serve`` once per machine; every WhisperType instance with
+``"model_server": true`` in its config then connects over a Unix socket
+instead of loading its own copy of the weights.
+
+Wire format, both directions: a 4-byte big-endian header length, a JSON
+header, then ``header["nbytes"]`` bytes of payload (raw float32 PCM for
+requests, nothing for responses).
+
+The server is private to the user running it: the socket lives in a
+per-user directory with mode 0600, and each side checks the other's uid
+before exchanging audio or text.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from voice_app.services.transcriber import Segment, Transcriber
+
+PROTOCOL_VERSION = 1
+# Largest JSON header and longest request audio accepted; anything bigger
+# is rejected before a buffer is allocated for it.
+MAX_HEADER_BYTES = 16 * 1024
+MAX_AUDIO_SECONDS = 30 * 60
+MAX_PAYLOAD_BYTES = MAX_AUDIO_SECONDS * 16000 * 4
+
+
+def _private_dir():
+    """The user's runtime directory, else a 0700 per-user directory in the temp dir."""
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return runtime
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"whispertype-{uid}")
+
+
+DEFAULT_SOCKET_PATH = os.path.join(_private_dir(), "whispertype.sock")
+_HEADER = struct.Struct(">I")
+# Windows builds of Python lack AF_UNIX; keep the module importable there.
+_UnixServer = getattr(socketserver, "UnixStreamServer", socketserver.TCPServer)
+
+
+def _recv_exact(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if k == 0:
+            raise ConnectionError("Connection closed")
+        got += k
+    return bytes(buf)
+
+
+def send_message(sock, header, payload=b""):
+    header = dict(header, nbytes=len(payload))
+    data = json.dumps(header).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_message(sock, max_payload=MAX_PAYLOAD_BYTES):
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    if size > MAX_HEADER_BYTES:
+        raise ValueError(f"Header of {size} bytes exceeds {MAX_HEADER_BYTES}")
+    header = json.loads(_recv_exact(sock, size).decode("utf-8"))
+    if not isinstance(header, dict):
+        raise ValueError("Header is not a JSON object")
+    nbytes = header.get("nbytes", 0)
+    if not isinstance(nbytes, int) or not 0 <= nbytes <= max_payload:
+        raise ValueError(f"Payload of {nbytes!r} bytes exceeds {max_payload}")
+    payload = _recv_exact(sock, nbytes)
+    return header, payload
+
+
+def peer_uid(sock):
+    """Return the uid of the process at the other end of a Unix socket, or None."""
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        return struct.unpack("3i", creds)[1]
+    if sys.platform == "darwin":
+        # getsockopt(SOL_LOCAL, LOCAL_PEERCRED) -> struct xucred {cr_version, cr_uid, ...}
+        creds = sock.getsockopt(0, 0x001, 76)
+        return struct.unpack_from("Ii", creds)[1]
+    return None
+
+
+def _ensure_private_dir(path):
+    """Create *path* as a 0700 directory, or check an existing one is ours and private."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if (not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid()
+            or st.st_mode & 0o077):
+        raise PermissionError(f"{path} must be a directory owned by you with mode 0700")
+
+
+def _remove_stale_socket(path):
+    """Unlink a leftover socket of ours at *path*; refuse to touch anything else."""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise PermissionError(f"{path} exists and is not a socket owned by you")
+    os.unlink(path)
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        try:
+            uid = peer_uid(self.request)
+        except OSError:
+            uid = None
+        if uid != os.getuid():
+            return
+        while True:
+            try:
+                header, payload = recv_message(self.request)
+            except (ConnectionError, OSError, ValueError):
+                return
+            op = header.get("op")
+            try:
+                if op == "hello":
+                    send_message(self.request, server.info())
+                elif op == "transcribe":
+                    audio = np.frombuffer(payload, dtype=np.float32)
+                    segments = server.transcriber.transcribe_segments(
+                        audio,
+                        language=header.get("language"),
+                        initial_prompt=header.get("initial_prompt"),
+                        profile=header.get("profile"),
+                        timestamps=bool(header.get("timestamps")),
+                    )
+                    send_message(self.request, {
+                        "ok": True, "segments": [list(seg) for seg in segments],
+                    })
+                else:
+                    send_message(self.request, {"ok": False, "error": f"unknown op {op!r}"})
+            except Exception as e:
+                send_message(self.request, {"ok": False, "error": str(e)})
+
+
+class ModelServer(socketserver.ThreadingMixIn, _UnixServer):
+    """Own one loaded model and answer transcribe requests from clients."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, transcriber, model_info):
+        self.transcriber = transcriber
+        self.model_info = model_info
+        if (os.path.dirname(socket_path) == _private_dir()
+                and not os.environ.get("XDG_RUNTIME_DIR")):
+            # The shared temp dir fallback: anyone could have pre-created it.
+            _ensure_private_dir(_private_dir())
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o600)
+
+    def info(self):
+        return {"ok": True, "version": PROTOCOL_VERSION, **self.model_info}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def serve_main(argv=None):
+    """Entry point for ``whispertype serve``."""
+    from voice_app.config.settings import load_config
+    from voice_app.services.model_cache import get_model_cache
+
+    config = load_config()
+    parser = argparse.ArgumentParser(prog="whispertype serve",
+                                     description="Serve one warm Whisper model over a Unix socket.")
+    parser.add_argument("--socket", default=config.get("model_server_socket") or DEFAULT_SOCKET_PATH)
+    parser.add_argument("--model", default=config["model"])
+    parser.add_argument("--model-path", default=config.get("model_path"))
+    parser.add_argument("--compute-type", default=config.get("compute_type", "int8"))
+    parser.add_argument("--profile", default=config.get("decode_profile", "auto"),
+                        help="default decode profile for clients that don't pick one")
+    args = parser.parse_args(argv)
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("The model server needs Unix domain sockets.", file=sys.stderr)
+        return 1
+
+    transcriber = Transcriber()
+    print(f"Loading model {args.model} ({args.compute_type})...", file=sys.stderr)
+    transcriber.load_model(model_name=args.model, model_path=args.model_path,
+                           compute_type=args.compute_type, profile=args.profile,
+                           cache=get_model_cache(config))
+
+    info = {"model": args.model, "model_path": args.model_path, "compute_type": args.compute_type}
+    try:
+        server = ModelServer(args.socket, transcriber, info)
+    except PermissionError as e:
+        print(f"Refusing to serve: {e}", file=sys.stderr)
+        return 1
+    print(f"Serving on {args.socket}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class RemoteTranscriber:
+    """Drop-in replacement for :class:`Transcriber` backed by the model server."""
+
+    def __init__(self, socket_path=None, timeout=120):
+        self.socket_path = socket_path or DEFAULT_SOCKET_PATH
+        self.timeout = timeout
+        self.model_name = None
+        self.profile = None
+        self._sock = None
+        self._local = None  # Transcriber used once the server is gone for good
+        self._load_args = None
+        self._lock = threading.Lock()
+
+    def load_model(self, model_name="base", model_path=None, compute_type="int8",
+                   cpu_threads=None, num_workers=None, profile=None, cache=None):
+        """Connect and check that the server holds the requested model.
+
+        Thread settings and the weight cache are the server's own;
+        *cpu_threads*, *num_workers* and *cache* are only used if the
+        server goes away later and the model has to be loaded locally.
+        Raises ``ConnectionError`` if no compatible server is running.
+        """
+        self._load_args = {
+            "model_name": model_name, "model_path": model_path, "compute_type": compute_type,
+            "cpu_threads": cpu_threads, "num_workers": num_workers, "profile": profile,
+            "cache": cache,
+        }
+        self._sock = self._connect(model_name, model_path, compute_type)
+        self.model_name = model_name
+        self.profile = profile
+
+    def _connect(self, model_name, model_path, compute_type):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ConnectionError("The model server needs Unix domain sockets")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(2)
+        try:
+            sock.connect(self.socket_path)
+            uid = peer_uid(sock)
+            if uid != os.getuid():
+                raise ConnectionError(f"server is run by uid {uid}, not by you")
+            send_message(sock, {"op": "hello"})
+            info, _ = recv_message(sock, max_payload=0)
+        except (OSError, ValueError) as e:
+            sock.close()
+            raise ConnectionError(f"No model server at {self.socket_path}: {e}") from e
+
+        wanted = {"model": model_name, "model_path": model_path, "compute_type": compute_type}
+        served = {k: info.get(k) for k in wanted}
+        if info.get("version") != PROTOCOL_VERSION or served != wanted:
+            sock.close()
+            raise ConnectionError(f"Model server serves {served}, wanted {wanted}")
+
+        sock.settimeout(self.timeout)
+        return sock
+
+    def _request(self, header, payload):
+        """Send one request; returns the response, or None once running locally.
+
+        A failed request is retried once on a fresh connection (the server
+        may have been restarted); if that fails too, the model is loaded
+        locally.  Called with ``self._lock`` held.
+        """
+        for _ in range(2):
+            try:
+                if self._sock is None:
+                    self._sock = self._connect(self._load_args["model_name"],
+                                               self._load_args["model_path"],
+                                               self._load_args["compute_type"])
+                send_message(self._sock, header, payload)
+                response, _ = recv_message(self._sock, max_payload=0)
+                return response
+            except (OSError, ValueError) as e:
+                error = e
+                if self._sock is not None:
+                    self._sock.close()
+                    self._sock = None
+        print(f"Model server lost, loading locally: {error}", file=sys.stderr)
+        local = Transcriber()
+        local.load_model(**self._load_args)
+        self._local = local
+        return None
+
+    def transcribe(self, audio, sample_rate=16000, language=None, initial_prompt=None,
+                   profile=None):
+        segments = self.transcribe_segments(
+            audio, sample_rate=sample_rate, language=language, initial_prompt=initial_prompt,
+            profile=profile,
+        )
+        text = " ".join(seg.text for seg in segments)
+        return text.strip()
+
+    def transcribe_segments(self, audio, sample_rate=16000, language=None, initial_prompt=None,
+                            profile=None, timestamps=False):
+        if self._load_args is None:
+            raise RuntimeError("Model not loaded")
+
+        audio = audio.reshape(-1)
+        if audio.dtype == np.int16:
+            audio_f32 = audio.astype(np.float32)
+            audio_f32 *= 1.0 / 32768.0
+        else:
+            audio_f32 = np.ascontiguousarray(audio, dtype=np.float32)
+        if audio_f32.nbytes > MAX_PAYLOAD_BYTES:
+            raise RuntimeError(f"Audio longer than {MAX_AUDIO_SECONDS} s for the model server")
+
+        header = {
+            "op": "transcribe", "language": language, "initial_prompt": initial_prompt,
+            "profile": profile or self.profile, "timestamps": timestamps,
+        }
+        # One request in flight per connection (streaming and final decode
+        # may overlap).
+        with self._lock:
+            local = self._local
+            if local is None:
+                response = self._request(header, audio_f32.tobytes())
+                local = self._local
+        if local is not None:
+            return local.transcribe_segments(
+                audio, sample_rate=sample_rate, language=language,
+                initial_prompt=initial_prompt, profile=profile, timestamps=timestamps,
+            )
+        if not response.get("ok"):
+            raise RuntimeError(f"Model server error: {response.get('error')}")
+        return [Segment(*seg) for seg in response["segments"]]
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._local = None
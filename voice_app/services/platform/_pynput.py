@@ -0,0 +1,87 @@
+"""Shared pynput hotkey listener for Linux and macOS.
+
+One ``keyboard.Listener`` thread runs for the lifetime of the manager and
+matches key events against a hotkey table that can be edited at any time.
+Muting only flips a flag, so suspending hotkeys around a paste and arming
+them again afterwards costs no thread start/stop.
+"""
+
+import threading
+
+from .base import PlatformHotkeyManager
+
+
+class PynputHotkeyManager(PlatformHotkeyManager):
+    """Hotkey table served by one long-lived pynput listener.
+
+    Subclasses provide ``_parse_hotkey`` to map WhisperType hotkey strings
+    to pynput's ``<ctrl>+<shift>+x`` syntax.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._table = {}    # hotkey_str -> (parsed keys, callback)
+        self._hotkeys = []  # pynput HotKey objects built from _table
+        self._listener = None
+
+    def register(self, hotkey_str, callback, *, suppress=True):
+        from pynput import keyboard
+
+        keys = keyboard.HotKey.parse(self._parse_hotkey(hotkey_str))
+        with self._lock:
+            self._table[hotkey_str] = (keys, callback)
+            self._rebuild()
+        self.start_listener()
+
+    def unregister(self, hotkey_str):
+        with self._lock:
+            if self._table.pop(hotkey_str, None) is not None:
+                self._rebuild()
+
+    def unregister_all(self):
+        with self._lock:
+            self._table.clear()
+            self._hotkeys = []
+
+    def unmute(self):
+        # Forget keys seen before or during the mute (e.g. our own Ctrl+V).
+        with self._lock:
+            self._rebuild()
+        super().unmute()
+
+    def start_listener(self):
+        from pynput import keyboard
+
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = keyboard.Listener(on_press=self._on_press,
+                                               on_release=self._on_release)
+            self._listener.daemon = True
+            self._listener.start()
+
+    def stop_listener(self):
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+
+    def _rebuild(self):
+        from pynput import keyboard
+
+        self._hotkeys = [keyboard.HotKey(keys, callback)
+                         for keys, callback in self._table.values()]
+
+    def _on_press(self, key, injected=False):
+        if self.muted or self._listener is None:
+            return
+        key = self._listener.canonical(key)
+        for hotkey in self._hotkeys:
+            hotkey.press(key)
+
+    def _on_release(self, key, injected=False):
+        if self.muted or self._listener is None:
+            return
+        key = self._listener.canonical(key)
+        for hotkey in self._hotkeys:
+            hotkey.release(key)
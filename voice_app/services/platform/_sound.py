@@ -1,30 +1,132 @@
-"""Cross-platform beep using sounddevice + numpy (replaces winsound.Beep)."""
+"""Cross-platform beep using sounddevice + numpy (replaces winsound.Beep).
+
+Tones are rendered once per (frequency, duration) and mixed into a single
+long-lived output stream, so a beep only appends to the mixer queue: no
+thread, no waveform maths and no device open per beep.  Opening the output
+device anew for each beep could also glitch the microphone capture on some
+host APIs.
+"""
 
 import threading
+import time
+from collections import deque
 
 import numpy as np
-import sounddevice as sd
 
 from .base import PlatformSoundPlayer
 
-# Default output sample rate for tones
+# Output sample rate used when the device's own rate can't be queried
 _TONE_SR = 44100
+_VOLUME = 0.4
+# Fade in/out to avoid clicks at the tone edges.
+_FADE_MS = 5
+# Stop the output stream (keeping the device open) after this much silence,
+# so the audio callback isn't woken while nothing plays.
+_IDLE_STOP_S = 5.0
+
+
+def _render_tone(frequency, duration_ms, rate):
+    n = int(rate * duration_ms / 1000)
+    wave = np.sin(2 * np.pi * frequency * np.arange(n) / rate) * _VOLUME
+    fade = min(n // 2, int(rate * _FADE_MS / 1000))
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade)
+        wave[:fade] *= ramp
+        wave[n - fade:] *= ramp[::-1]
+    return wave.astype(np.float32)
 
 
 class CrossPlatformSoundPlayer(PlatformSoundPlayer):
-    """Generate simple sine-wave beeps via sounddevice."""
+    """Sine-wave beeps mixed into one persistent sounddevice output stream."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stream = None
+        self._rate = _TONE_SR
+        self._tones = {}        # (frequency, duration_ms) -> float32 waveform
+        self._queue = deque()   # voices waiting for the audio callback
+        self._voices = []       # [waveform, position]; negative position = delay
+        self._last_beep = 0.0
+        self._idle_timer = None
 
-    def beep(self, frequency, duration_ms):
-        threading.Thread(
-            target=self._play, args=(frequency, duration_ms), daemon=True
-        ).start()
+    def warm_up(self):
+        try:
+            with self._lock:
+                self._open()
+        except Exception:
+            pass  # audio feedback is best-effort
 
-    @staticmethod
-    def _play(frequency, duration_ms):
+    def beep(self, frequency, duration_ms, delay_ms=0):
         try:
-            n_samples = int(_TONE_SR * duration_ms / 1000)
-            t = np.linspace(0, duration_ms / 1000, n_samples, endpoint=False)
-            wave = (np.sin(2 * np.pi * frequency * t) * 0.4).astype(np.float32)
-            sd.play(wave, samplerate=_TONE_SR, blocking=True)
+            with self._lock:
+                stream = self._open()
+                wave = self._tone(frequency, duration_ms)
+                self._queue.append([wave, -int(self._rate * delay_ms / 1000)])
+                self._last_beep = time.monotonic()
+                if not stream.active:
+                    stream.stop()
+                    stream.start()
+                if self._idle_timer is None:
+                    self._schedule_idle_stop(_IDLE_STOP_S)
         except Exception:
             pass  # audio feedback is best-effort
+
+    def _open(self):
+        if self._stream is None:
+            import sounddevice as sd
+
+            try:
+                self._rate = int(sd.query_devices(kind="output")["default_samplerate"])
+            except Exception:
+                self._rate = _TONE_SR
+            self._tones.clear()
+            self._stream = sd.OutputStream(
+                samplerate=self._rate, channels=1, dtype="float32",
+                latency="low", callback=self._callback,
+            )
+        return self._stream
+
+    def _tone(self, frequency, duration_ms):
+        key = (frequency, duration_ms)
+        wave = self._tones.get(key)
+        if wave is None:
+            wave = self._tones[key] = _render_tone(frequency, duration_ms, self._rate)
+        return wave
+
+    def _schedule_idle_stop(self, seconds):
+        self._idle_timer = threading.Timer(seconds, self._idle_stop)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _idle_stop(self):
+        with self._lock:
+            self._idle_timer = None
+            remaining = self._last_beep + _IDLE_STOP_S - time.monotonic()
+            if remaining > 0 or self._queue or self._voices:
+                self._schedule_idle_stop(max(remaining, 0.5))
+                return
+            try:
+                self._stream.stop()
+            except Exception:
+                pass
+
+    def _callback(self, outdata, frames, time_info, status):
+        out = outdata[:, 0]
+        out.fill(0.0)
+        while self._queue:
+            self._voices.append(self._queue.popleft())
+        if not self._voices:
+            return
+        keep = []
+        for voice in self._voices:
+            wave, pos = voice
+            start = max(0, -pos)
+            src = max(0, pos)
+            n = min(frames - start, len(wave) - src)
+            if n > 0:
+                out[start:start + n] += wave[src:src + n]
+            voice[1] = pos + frames
+            if voice[1] < len(wave):
+                keep.append(voice)
+        self._voices = keep
+        np.clip(out, -1.0, 1.0, out=out)
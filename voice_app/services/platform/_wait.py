@@ -0,0 +1,81 @@
+"""Short, adaptive readiness waits for the paste path.
+
+Instead of sleeping a fixed time after setting the clipboard or switching
+focus, poll for the condition itself with a backoff starting at 2 ms.  Each
+named wait adapts its timeout to how long the condition has recently taken
+on this machine (a few times the slowest recent success, within
+``floor``/``ceiling``), and every wait is reported to the tracer as
+``wait.<name>`` with its actual duration.
+"""
+
+import time
+from collections import deque
+
+from voice_app.services.tracing import tracer
+
+# Apps read the clipboard asynchronously after Ctrl+V and nothing tells us
+# when they have, so restoring the old contents still waits this long.
+PASTE_SETTLE_SECONDS = 0.25
+
+_FIRST_INTERVAL = 0.002
+_MAX_INTERVAL = 0.02
+_HISTORY = 16
+_waiters = {}
+
+
+class Waiter:
+    def __init__(self, name, floor, ceiling, factor=3.0):
+        self.name = name
+        self.floor = floor
+        self.ceiling = ceiling
+        self.factor = factor
+        self._recent = deque(maxlen=_HISTORY)
+
+    @property
+    def timeout(self):
+        if not self._recent:
+            return self.ceiling
+        return min(self.ceiling, max(self.floor, self.factor * max(self._recent)))
+
+    def record(self, elapsed, ok):
+        """Report one wait (also used by callers that poll on their own timer)."""
+        if ok:
+            self._recent.append(elapsed)
+        tracer.record(f"wait.{self.name}", elapsed)
+        if not ok:
+            tracer.record(f"wait.{self.name}.timeout", elapsed)
+
+    def wait(self, predicate):
+        """Poll *predicate* until it is true or the timeout passes.  Returns success."""
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        interval = _FIRST_INTERVAL
+        while True:
+            try:
+                ok = bool(predicate())
+            except Exception:
+                ok = False
+            now = time.perf_counter()
+            if ok or now >= deadline:
+                self.record(now - start, ok)
+                return ok
+            time.sleep(min(interval, deadline - now))
+            interval = min(interval * 2, _MAX_INTERVAL)
+
+
+def waiter(name, floor=0.02, ceiling=0.5):
+    """Return the shared :class:`Waiter` for *name*, creating it on first use."""
+    w = _waiters.get(name)
+    if w is None:
+        w = _waiters[name] = Waiter(name, floor, ceiling)
+    return w
+
+
+def wait_until(name, predicate, floor=0.02, ceiling=0.5):
+    return waiter(name, floor, ceiling).wait(predicate)
+
+
+def settle(name, seconds=PASTE_SETTLE_SECONDS):
+    """Sleep for a wait that has no observable end condition, and report it."""
+    time.sleep(seconds)
+    tracer.record(f"wait.{name}", seconds)
@@ -0,0 +1,160 @@
+"""Persistent X11 connection for focus and window-class lookups.
+
+One python-xlib display connection replaces an ``xdotool`` fork/exec per
+query.  ``_NET_ACTIVE_WINDOW`` is tracked from PropertyNotify events on the
+root window, so reading the active window is usually free, and WM_CLASS is
+cached per window.  Clipboard owner and TARGETS queries go over the same
+connection instead of running ``xclip``.  ``get_connection()`` returns None when python-xlib is
+missing or no X display is reachable; callers then fall back to xdotool.
+"""
+
+import os
+import sys
+import threading
+import time
+
+_conn = None
+_conn_failed = False
+_conn_lock = threading.Lock()
+
+# _NET_ACTIVE_WINDOW source indication: 2 = pager / user action, which
+# window managers honour without focus-stealing prevention.
+_SOURCE_PAGER = 2
+# How long to wait for the clipboard owner to answer a TARGETS request.
+SELECTION_TIMEOUT = 0.2
+
+
+class X11Connection:
+    def __init__(self):
+        from Xlib import X, display
+
+        self._X = X
+        self._display = display.Display()
+        self._root = self._display.screen().root
+        self._net_active = self._display.intern_atom("_NET_ACTIVE_WINDOW")
+        self._lock = threading.Lock()
+        self._class_cache = {}
+        self._active = None
+        self._active_stale = True
+        self._atoms = {}
+        self._requestor = None  # unmapped window that receives selection replies
+        self._root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._display.flush()
+
+    def active_window(self):
+        """Return the active window id, or None."""
+        with self._lock:
+            self._drain_events()
+            if self._active_stale:
+                prop = self._root.get_full_property(self._net_active, self._X.AnyPropertyType)
+                wid = int(prop.value[0]) if prop is not None and len(prop.value) else 0
+                self._active = wid or None
+                self._active_stale = False
+            return self._active
+
+    def activate(self, window_id):
+        """Ask the window manager to activate *window_id*."""
+        from Xlib import protocol
+
+        with self._lock:
+            window = self._display.create_resource_object("window", int(window_id))
+            event = protocol.event.ClientMessage(
+                window=window,
+                client_type=self._net_active,
+                data=(32, [_SOURCE_PAGER, self._X.CurrentTime, 0, 0, 0]),
+            )
+            mask = self._X.SubstructureRedirectMask | self._X.SubstructureNotifyMask
+            self._root.send_event(event, event_mask=mask)
+            self._display.flush()
+            self._active_stale = True
+        return True
+
+    def window_class(self, window_id):
+        """Return the lower-cased WM_CLASS class name of *window_id* ("" if unknown)."""
+        window_id = int(window_id)
+        with self._lock:
+            cls = self._class_cache.get(window_id)
+            if cls is None:
+                window = self._display.create_resource_object("window", window_id)
+                try:
+                    wm_class = window.get_wm_class()
+                except Exception:
+                    wm_class = None
+                cls = wm_class[-1].lower() if wm_class else ""
+                if len(self._class_cache) > 256:
+                    self._class_cache.clear()
+                self._class_cache[window_id] = cls
+            return cls
+
+    def clipboard_owner(self):
+        """Return the window id owning CLIPBOARD (0 if none)."""
+        with self._lock:
+            owner = self._display.get_selection_owner(self._atom("CLIPBOARD"))
+            return int(getattr(owner, "id", owner) or 0)
+
+    def clipboard_offers(self, targets):
+        """Return the first of *targets* (names) the clipboard owner offers, or None."""
+        X = self._X
+        with self._lock:
+            clipboard = self._atom("CLIPBOARD")
+            owner = self._display.get_selection_owner(clipboard)
+            if not getattr(owner, "id", owner):
+                return None
+            if self._requestor is None:
+                self._requestor = self._root.create_window(0, 0, 1, 1, 0, X.CopyFromParent)
+            prop = self._atom("WHISPERTYPE_TARGETS")
+            self._requestor.convert_selection(clipboard, self._atom("TARGETS"), prop,
+                                              X.CurrentTime)
+            self._display.flush()
+            deadline = time.monotonic() + SELECTION_TIMEOUT
+            while time.monotonic() < deadline:
+                while self._display.pending_events():
+                    event = self._display.next_event()
+                    if event.type != X.SelectionNotify or event.selection != clipboard:
+                        self._handle_event(event)
+                        continue
+                    if event.property == X.NONE:
+                        return None
+                    reply = self._requestor.get_full_property(prop, X.AnyPropertyType)
+                    self._requestor.delete_property(prop)
+                    offered = set(reply.value) if reply is not None else set()
+                    return next((t for t in targets if self._atom(t) in offered), None)
+                time.sleep(0.005)
+            return None
+
+    def _atom(self, name):
+        atom = self._atoms.get(name)
+        if atom is None:
+            atom = self._atoms[name] = self._display.intern_atom(name)
+        return atom
+
+    def _drain_events(self):
+        while self._display.pending_events():
+            self._handle_event(self._display.next_event())
+
+    def _handle_event(self, event):
+        if event.type == self._X.PropertyNotify and event.atom == self._net_active:
+            self._active_stale = True
+
+    def close(self):
+        with self._lock:
+            self._display.close()
+
+
+def get_connection():
+    """Return the shared :class:`X11Connection`, or None if X11 is unavailable."""
+    global _conn, _conn_failed
+    with _conn_lock:
+        if _conn is None and not _conn_failed:
+            if not os.environ.get("DISPLAY"):
+                _conn_failed = True
+                return None
+            try:
+                _conn = X11Connection()
+            except ImportError:
+                _conn_failed = True
+            except Exception as e:
+                print(f"[WhisperType] X11 connection failed, using xdotool: {e}",
+                      file=sys.stderr)
+                _conn_failed = True
+        return _conn
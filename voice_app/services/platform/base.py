@@ -19,6 +19,21 @@ class PlatformFocusManager(ABC):
     def saved_window_id(self):
         """Return the opaque window identifier (hwnd, pid, window-id, etc.)."""
 
+    def active_window_id(self):
+        """Return the focused window's id (same form as ``saved_window_id``).
+
+        None means it cannot be determined on this platform.
+        """
+        return None
+
+    def focus_token(self):
+        """Return an opaque token for the saved target, for :meth:`restore_token`."""
+        return self.saved_window_id
+
+    def restore_token(self, token):
+        """Make *token* the saved target and re-activate it. Returns True on success."""
+        raise NotImplementedError
+
 
 class PlatformTextInjector(ABC):
     """Inject transcribed text into the target window."""
@@ -27,19 +42,64 @@ class PlatformTextInjector(ABC):
     def inject_text(self, text, target_window_id=None, preserve_clipboard=True):
         """Paste *text* into the target window (or current foreground)."""
 
+    def delete_chars(self, count):
+        """Send *count* Backspace keystrokes to the foreground window."""
+        raise NotImplementedError
+
+    def save_clipboard(self):
+        """Return an opaque snapshot of the clipboard for :meth:`restore_clipboard`.
+
+        Keeps non-text contents (images, rich text) where the platform allows.
+        None means there was nothing to save.
+        """
+        return None
+
+    def restore_clipboard(self, snapshot):
+        """Put a :meth:`save_clipboard` snapshot back on the clipboard."""
+
+    def type_text(self, text):
+        """Type *text* into the foreground window as keystrokes.
+
+        Used for live (incremental) injection, where pasting every few words
+        would churn the clipboard.  Falls back to :meth:`inject_text`.
+        """
+        self.inject_text(text)
+
 
 class PlatformHotkeyManager(ABC):
-    """Register and manage global hotkeys."""
+    """Register and manage global hotkeys.
+
+    The hotkey table can be edited at any time without restarting the
+    listener; :meth:`mute` suspends every hotkey until :meth:`unmute`.
+    """
+
+    _muted = False
 
     @abstractmethod
     def register(self, hotkey_str, callback, *, suppress=True):
-        """Register a global hotkey. *suppress* prevents the keystroke from
-        reaching the focused app (best-effort on non-Windows platforms)."""
+        """Register (or replace) a global hotkey. *suppress* prevents the
+        keystroke from reaching the focused app (best-effort on non-Windows
+        platforms)."""
+
+    @abstractmethod
+    def unregister(self, hotkey_str):
+        """Remove one hotkey; unknown hotkeys are ignored."""
 
     @abstractmethod
     def unregister_all(self):
         """Remove every registered hotkey."""
 
+    @property
+    def muted(self):
+        return self._muted
+
+    def mute(self):
+        """Ignore hotkeys until :meth:`unmute`, keeping the listener running."""
+        self._muted = True
+
+    def unmute(self):
+        self._muted = False
+
     def start_listener(self):
         """Start listening for hotkeys (no-op if always listening)."""
 
@@ -51,5 +111,9 @@ class PlatformSoundPlayer(ABC):
     """Play simple audio feedback tones."""
 
     @abstractmethod
-    def beep(self, frequency, duration_ms):
-        """Play a sine-wave beep at *frequency* Hz for *duration_ms* ms."""
+    def beep(self, frequency, duration_ms, delay_ms=0):
+        """Play a sine-wave beep at *frequency* Hz for *duration_ms* ms,
+        starting *delay_ms* from now.  Returns without waiting."""
+
+    def warm_up(self):
+        """Open the output device ahead of the first beep (optional)."""
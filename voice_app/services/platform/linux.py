@@ -1,12 +1,16 @@
-"""Linux platform adapter — xdotool + pynput."""
+"""Linux platform adapter — python-xlib (or xdotool) + pynput."""
 
 import os
 import shutil
 import subprocess
 import sys
-import time
 
-from .base import PlatformFocusManager, PlatformTextInjector, PlatformHotkeyManager
+from voice_app.services.tracing import tracer
+
+from ._pynput import PynputHotkeyManager
+from ._wait import settle, wait_until
+from ._x11 import get_connection
+from .base import PlatformFocusManager, PlatformTextInjector
 
 
 def _is_wayland():
@@ -28,12 +32,12 @@ def _has_xdotool():
 
 
 class LinuxFocusManager(PlatformFocusManager):
-    """Save/restore the active X11 window via xdotool."""
+    """Save/restore the active X11 window via python-xlib, else xdotool."""
 
     def __init__(self):
         self._saved_wid = None
         _warn_wayland()
-        if not _has_xdotool():
+        if get_connection() is None and not _has_xdotool():
             print(
                 "[WhisperType] WARNING: xdotool not found. "
                 "Install it with: sudo apt install xdotool",
@@ -41,6 +45,14 @@ class LinuxFocusManager(PlatformFocusManager):
             )
 
     def save_focus(self):
+        x11 = get_connection()
+        if x11 is not None:
+            try:
+                wid = x11.active_window()
+                self._saved_wid = str(wid) if wid else None
+                return
+            except Exception:
+                pass
         try:
             result = subprocess.run(
                 ["xdotool", "getactivewindow"],
@@ -54,6 +66,12 @@ class LinuxFocusManager(PlatformFocusManager):
     def restore_focus(self):
         if not self._saved_wid:
             return False
+        x11 = get_connection()
+        if x11 is not None:
+            try:
+                return x11.activate(self._saved_wid)
+            except Exception:
+                pass
         try:
             result = subprocess.run(
                 ["xdotool", "windowactivate", self._saved_wid],
@@ -67,6 +85,32 @@ class LinuxFocusManager(PlatformFocusManager):
     def saved_window_id(self):
         return self._saved_wid
 
+    def restore_token(self, token):
+        self._saved_wid = token
+        return self.restore_focus()
+
+    def active_window_id(self):
+        x11 = get_connection()
+        if x11 is not None:
+            try:
+                wid = x11.active_window()
+                return str(wid) if wid else None
+            except Exception:
+                pass
+        if not _has_xdotool():
+            return None
+        try:
+            result = subprocess.run(
+                ["xdotool", "getactivewindow"],
+                capture_output=True, text=True, timeout=2,
+            )
+            return result.stdout.strip() or None
+        except Exception:
+            return None
+
+
+_IMAGE_TARGETS = ("image/png", "image/jpeg", "image/bmp")
+
 
 class LinuxTextInjector(PlatformTextInjector):
     """Paste text via clipboard + Ctrl+V on Linux (X11)."""
@@ -74,56 +118,146 @@ class LinuxTextInjector(PlatformTextInjector):
     def inject_text(self, text, target_window_id=None, preserve_clipboard=True):
         import pyperclip
 
-        old_clipboard = None
-        if preserve_clipboard:
-            try:
-                old_clipboard = pyperclip.paste()
-            except Exception:
-                pass
+        old_clipboard = self.save_clipboard() if preserve_clipboard else None
 
-        pyperclip.copy(text)
-        time.sleep(0.05)
+        owner = self._clipboard_owner()
+        with tracer.span("clipboard.set"):
+            pyperclip.copy(text)
+        if owner is not None:
+            # Done once the copy's helper process owns the selection; checked
+            # over the X11 connection instead of reading the text back.
+            wait_until("clipboard.set", lambda: self._clipboard_owner() not in (0, owner))
+        else:
+            wait_until("clipboard.set", lambda: pyperclip.paste() == text)
 
-        is_term = self._is_terminal(target_window_id)
+        with tracer.span("terminal.detect"):
+            is_term = self._is_terminal(target_window_id)
 
         from pynput.keyboard import Controller, Key
         kb = Controller()
 
-        if is_term:
-            # Most Linux terminals use Ctrl+Shift+V
-            kb.press(Key.ctrl)
-            kb.press(Key.shift)
-            kb.press("v")
-            kb.release("v")
-            kb.release(Key.shift)
-            kb.release(Key.ctrl)
-        else:
-            kb.press(Key.ctrl)
-            kb.press("v")
-            kb.release("v")
-            kb.release(Key.ctrl)
-        time.sleep(0.05)
+        with tracer.span("keystroke"):
+            if is_term:
+                # Most Linux terminals use Ctrl+Shift+V
+                kb.press(Key.ctrl)
+                kb.press(Key.shift)
+                kb.press("v")
+                kb.release("v")
+                kb.release(Key.shift)
+                kb.release(Key.ctrl)
+            else:
+                kb.press(Key.ctrl)
+                kb.press("v")
+                kb.release("v")
+                kb.release(Key.ctrl)
 
         if preserve_clipboard and old_clipboard is not None:
-            time.sleep(0.2)
+            settle("paste.settle")
+            self.restore_clipboard(old_clipboard)
+
+    def save_clipboard(self):
+        """Snapshot the clipboard as ``(mime_type, data)``.
+
+        Images are kept as-is through xclip when it is installed; anything
+        else is saved as text.  The clipboard's formats are checked over the
+        shared X11 connection, so xclip only runs when it holds an image.
+        """
+        with tracer.span("clipboard.save"):
+            if shutil.which("xclip"):
+                try:
+                    image = self._clipboard_image_target()
+                    if image:
+                        data = subprocess.run(
+                            ["xclip", "-selection", "clipboard", "-o", "-t", image],
+                            capture_output=True, timeout=2,
+                        ).stdout
+                        if data:
+                            return (image, data)
+                except Exception:
+                    pass
+            import pyperclip
+            try:
+                return ("text/plain", pyperclip.paste())
+            except Exception:
+                return None
+
+    @staticmethod
+    def _clipboard_owner():
+        """CLIPBOARD's owner window id (0 if none), or None without X11."""
+        x11 = get_connection()
+        if x11 is None:
+            return None
+        try:
+            return x11.clipboard_owner()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _clipboard_image_target():
+        x11 = get_connection()
+        if x11 is not None:
+            return x11.clipboard_offers(_IMAGE_TARGETS)
+        targets = subprocess.run(
+            ["xclip", "-selection", "clipboard", "-o", "-t", "TARGETS"],
+            capture_output=True, text=True, timeout=1,
+        ).stdout.split()
+        return next((t for t in _IMAGE_TARGETS if t in targets), None)
+
+    def restore_clipboard(self, snapshot):
+        mime, data = snapshot
+        with tracer.span("clipboard.restore"):
             try:
-                pyperclip.copy(old_clipboard)
+                if mime == "text/plain":
+                    import pyperclip
+                    pyperclip.copy(data)
+                else:
+                    # xclip forks to keep serving the selection; don't wait on it.
+                    proc = subprocess.Popen(
+                        ["xclip", "-selection", "clipboard", "-t", mime, "-i"],
+                        stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
+                    proc.stdin.write(data)
+                    proc.stdin.close()
             except Exception:
                 pass
 
+    def delete_chars(self, count):
+        from pynput.keyboard import Controller, Key
+        kb = Controller()
+        with tracer.span("keystroke.backspace"):
+            for _ in range(count):
+                kb.press(Key.backspace)
+                kb.release(Key.backspace)
+
+    def type_text(self, text):
+        from pynput.keyboard import Controller
+        with tracer.span("keystroke.type"):
+            Controller().type(text)
+
     @staticmethod
     def _is_terminal(window_id):
         """Detect if the window is a terminal by its WM_CLASS."""
-        if not window_id or not _has_xdotool():
+        if not window_id:
+            return False
+        cls = None
+        x11 = get_connection()
+        if x11 is not None:
+            try:
+                cls = x11.window_class(window_id)
+            except Exception:
+                cls = None
+        if cls is None and not _has_xdotool():
             return False
         try:
-            result = subprocess.run(
-                ["xdotool", "getwindowclassname", str(window_id)],
-                capture_output=True, text=True, timeout=2,
-            )
-            if result.returncode != 0:
-                return False
-            cls = result.stdout.strip().lower()
+            if cls is None:
+                result = subprocess.run(
+                    ["xdotool", "getwindowclassname", str(window_id)],
+                    capture_output=True, text=True, timeout=2,
+                )
+                if result.returncode != 0:
+                    return False
+                cls = result.stdout.strip().lower()
             terminal_hints = [
                 "gnome-terminal", "konsole", "xterm", "urxvt", "alacritty",
                 "kitty", "terminator", "tilix", "sakura", "xfce4-terminal",
@@ -134,34 +268,16 @@ class LinuxTextInjector(PlatformTextInjector):
             return False
 
 
-class LinuxHotkeyManager(PlatformHotkeyManager):
+class LinuxHotkeyManager(PynputHotkeyManager):
     """Global hotkeys via pynput on Linux.
 
     Requires X11.  On Wayland, pynput's global listener may not work.
     """
 
     def __init__(self):
-        self._listeners = []
+        super().__init__()
         _warn_wayland()
 
-    def register(self, hotkey_str, callback, *, suppress=True):
-        from pynput import keyboard
-
-        combo = self._parse_hotkey(hotkey_str)
-
-        def on_activate():
-            callback()
-
-        listener = keyboard.GlobalHotKeys({combo: on_activate})
-        listener.daemon = True
-        listener.start()
-        self._listeners.append(listener)
-
-    def unregister_all(self):
-        for listener in self._listeners:
-            listener.stop()
-        self._listeners.clear()
-
     @staticmethod
     def _parse_hotkey(hotkey_str):
         """Convert WhisperType hotkey string to pynput format.
@@ -2,9 +2,12 @@
 
 import subprocess
 import sys
-import time
 
-from .base import PlatformFocusManager, PlatformTextInjector, PlatformHotkeyManager
+from voice_app.services.tracing import tracer
+
+from ._pynput import PynputHotkeyManager
+from ._wait import settle, wait_until
+from .base import PlatformFocusManager, PlatformTextInjector
 
 
 class MacOSFocusManager(PlatformFocusManager):
@@ -36,6 +39,20 @@ class MacOSFocusManager(PlatformFocusManager):
             return None
         return self._saved_app.processIdentifier()
 
+    def active_window_id(self):
+        try:
+            from AppKit import NSWorkspace
+            return NSWorkspace.sharedWorkspace().frontmostApplication().processIdentifier()
+        except Exception:
+            return None
+
+    def focus_token(self):
+        return self._saved_app
+
+    def restore_token(self, token):
+        self._saved_app = token
+        return self.restore_focus()
+
 
 class MacOSTextInjector(PlatformTextInjector):
     """Paste text via clipboard + Cmd+V on macOS."""
@@ -43,34 +60,87 @@ class MacOSTextInjector(PlatformTextInjector):
     def inject_text(self, text, target_window_id=None, preserve_clipboard=True):
         import pyperclip
 
-        old_clipboard = None
-        if preserve_clipboard:
-            try:
-                old_clipboard = pyperclip.paste()
-            except Exception:
-                pass
+        old_clipboard = self.save_clipboard() if preserve_clipboard else None
 
-        pyperclip.copy(text)
-        time.sleep(0.05)
+        with tracer.span("clipboard.set"):
+            pyperclip.copy(text)
+        wait_until("clipboard.set", lambda: pyperclip.paste() == text)
 
         # Simulate Cmd+V via pynput
         from pynput.keyboard import Controller, Key
         kb = Controller()
-        kb.press(Key.cmd)
-        kb.press("v")
-        kb.release("v")
-        kb.release(Key.cmd)
-        time.sleep(0.05)
+        with tracer.span("keystroke"):
+            kb.press(Key.cmd)
+            kb.press("v")
+            kb.release("v")
+            kb.release(Key.cmd)
 
         if preserve_clipboard and old_clipboard is not None:
-            time.sleep(0.2)
+            settle("paste.settle")
+            self.restore_clipboard(old_clipboard)
+
+    def save_clipboard(self):
+        """Snapshot every pasteboard item with all of its types.
+
+        Falls back to plain text through pyperclip when AppKit (pyobjc) is
+        not available.
+        """
+        with tracer.span("clipboard.save"):
+            try:
+                from AppKit import NSPasteboard
+            except ImportError:
+                import pyperclip
+                try:
+                    return ("text", pyperclip.paste())
+                except Exception:
+                    return None
+            items = []
+            for item in NSPasteboard.generalPasteboard().pasteboardItems() or []:
+                types = {}
+                for t in item.types():
+                    data = item.dataForType_(t)
+                    if data is not None:
+                        types[t] = data
+                items.append(types)
+            return ("items", items)
+
+    def restore_clipboard(self, snapshot):
+        kind, data = snapshot
+        with tracer.span("clipboard.restore"):
             try:
-                pyperclip.copy(old_clipboard)
+                if kind == "text":
+                    import pyperclip
+                    pyperclip.copy(data)
+                    return
+                from AppKit import NSPasteboard, NSPasteboardItem
+                pb = NSPasteboard.generalPasteboard()
+                pb.clearContents()
+                new_items = []
+                for types in data:
+                    item = NSPasteboardItem.alloc().init()
+                    for t, value in types.items():
+                        item.setData_forType_(value, t)
+                    new_items.append(item)
+                if new_items:
+                    pb.writeObjects_(new_items)
             except Exception:
                 pass
 
+    def delete_chars(self, count):
+        from pynput.keyboard import Controller, Key
+        kb = Controller()
+        with tracer.span("keystroke.backspace"):
+            for _ in range(count):
+                kb.press(Key.backspace)
+                kb.release(Key.backspace)
+
+    def type_text(self, text):
+        from pynput.keyboard import Controller
+        with tracer.span("keystroke.type"):
+            Controller().type(text)
 
-class MacOSHotkeyManager(PlatformHotkeyManager):
+
+class MacOSHotkeyManager(PynputHotkeyManager):
     """Global hotkeys via pynput on macOS.
 
     Notes:
@@ -81,7 +151,7 @@ class MacOSHotkeyManager(PlatformHotkeyManager):
     """
 
     def __init__(self):
-        self._listeners = []
+        super().__init__()
         self._check_accessibility()
 
     @staticmethod
@@ -99,24 +169,6 @@ class MacOSHotkeyManager(PlatformHotkeyManager):
         except ImportError:
             pass
 
-    def register(self, hotkey_str, callback, *, suppress=True):
-        from pynput import keyboard
-
-        combo = self._parse_hotkey(hotkey_str)
-
-        def on_activate():
-            callback()
-
-        listener = keyboard.GlobalHotKeys({combo: on_activate})
-        listener.daemon = True
-        listener.start()
-        self._listeners.append(listener)
-
-    def unregister_all(self):
-        for listener in self._listeners:
-            listener.stop()
-        self._listeners.clear()
-
     @staticmethod
     def _parse_hotkey(hotkey_str):
         """Convert WhisperType hotkey string to pynput format.
@@ -7,8 +7,11 @@ platform abstraction layer.  All Win32 ctypes code lives here.
 import ctypes
 import ctypes.wintypes as wintypes
 import sys
-import time
+import threading
 
+from voice_app.services.tracing import tracer
+
+from ._wait import settle, wait_until
 from .base import PlatformFocusManager, PlatformTextInjector, PlatformHotkeyManager
 
 # ---------------------------------------------------------------------------
@@ -24,6 +27,10 @@ kernel32.GlobalLock.argtypes = [ctypes.c_void_p]
 kernel32.GlobalLock.restype = ctypes.c_void_p
 kernel32.GlobalUnlock.argtypes = [ctypes.c_void_p]
 kernel32.GlobalUnlock.restype = wintypes.BOOL
+kernel32.GlobalSize.argtypes = [ctypes.c_void_p]
+kernel32.GlobalSize.restype = ctypes.c_size_t
+kernel32.GlobalFree.argtypes = [ctypes.c_void_p]
+kernel32.GlobalFree.restype = ctypes.c_void_p
 
 user32.OpenClipboard.argtypes = [wintypes.HWND]
 user32.OpenClipboard.restype = wintypes.BOOL
@@ -37,6 +44,8 @@ user32.SetClipboardData.argtypes = [wintypes.UINT, ctypes.c_void_p]
 user32.SetClipboardData.restype = ctypes.c_void_p
 user32.IsClipboardFormatAvailable.argtypes = [wintypes.UINT]
 user32.IsClipboardFormatAvailable.restype = wintypes.BOOL
+user32.EnumClipboardFormats.argtypes = [wintypes.UINT]
+user32.EnumClipboardFormats.restype = wintypes.UINT
 user32.SendInput.argtypes = [wintypes.UINT, ctypes.c_void_p, ctypes.c_int]
 user32.SendInput.restype = wintypes.UINT
 user32.GetClassNameW.argtypes = [wintypes.HWND, ctypes.c_wchar_p, ctypes.c_int]
@@ -44,6 +53,25 @@ user32.GetClassNameW.restype = ctypes.c_int
 
 CF_UNICODETEXT = 13
 GMEM_MOVEABLE = 0x0002
+# Formats whose handles are GDI objects rather than global memory (the
+# memory-backed CF_DIB / CF_DIBV5 carry the same images), plus the ones
+# Windows synthesises from others.
+CF_BITMAP = 2
+CF_METAFILEPICT = 3
+CF_PALETTE = 9
+CF_ENHMETAFILE = 14
+CF_OWNERDISPLAY = 0x0080
+CF_DSPBITMAP = 0x0082
+CF_DSPMETAFILEPICT = 0x0083
+CF_DSPENHMETAFILE = 0x008E
+_NON_MEMORY_FORMATS = {
+    CF_BITMAP, CF_METAFILEPICT, CF_PALETTE, CF_ENHMETAFILE,
+    CF_OWNERDISPLAY, CF_DSPBITMAP, CF_DSPMETAFILEPICT, CF_DSPENHMETAFILE,
+}
+# CF_PRIVATEFIRST..CF_GDIOBJLAST: private handles the owner frees itself and
+# GDI objects, neither of which can be copied as bytes.
+CF_PRIVATEFIRST = 0x0200
+CF_GDIOBJLAST = 0x03FF
 
 INPUT_KEYBOARD = 1
 KEYEVENTF_KEYUP = 0x0002
@@ -54,6 +82,7 @@ VK_MENU = 0x12  # Alt
 VK_LWIN = 0x5B
 VK_RWIN = 0x5C
 VK_V = 0x56
+VK_BACK = 0x08
 
 
 # ---------------------------------------------------------------------------
@@ -115,10 +144,9 @@ def _set_clipboard_text(text):
         h = kernel32.GlobalAlloc(GMEM_MOVEABLE, len(data))
         if not h:
             return False
-        ptr = kernel32.GlobalLock(h)
-        ctypes.memmove(ptr, data, len(data))
-        kernel32.GlobalUnlock(h)
-        user32.SetClipboardData(CF_UNICODETEXT, h)
+        if not _fill_global(h, data) or not user32.SetClipboardData(CF_UNICODETEXT, h):
+            kernel32.GlobalFree(h)
+            return False
         return True
     finally:
         user32.CloseClipboard()
@@ -144,6 +172,63 @@ def _get_clipboard_text():
         user32.CloseClipboard()
 
 
+def _fill_global(h, data):
+    """Copy *data* into global memory *h*; False if it can't be locked."""
+    ptr = kernel32.GlobalLock(h)
+    if not ptr:
+        return False
+    try:
+        ctypes.memmove(ptr, data, len(data))
+    finally:
+        kernel32.GlobalUnlock(h)
+    return True
+
+
+def _is_memory_format(fmt):
+    return fmt not in _NON_MEMORY_FORMATS and not CF_PRIVATEFIRST <= fmt <= CF_GDIOBJLAST
+
+
+def _save_clipboard_formats():
+    """Copy every memory-backed clipboard format: ``[(format, bytes), ...]``."""
+    if not user32.OpenClipboard(0):
+        return None
+    try:
+        saved = []
+        fmt = user32.EnumClipboardFormats(0)
+        while fmt:
+            if _is_memory_format(fmt):
+                h = user32.GetClipboardData(fmt)
+                ptr = kernel32.GlobalLock(h) if h else None
+                if ptr:
+                    try:
+                        saved.append((fmt, ctypes.string_at(ptr, kernel32.GlobalSize(h))))
+                    finally:
+                        kernel32.GlobalUnlock(h)
+            fmt = user32.EnumClipboardFormats(fmt)
+        return saved
+    finally:
+        user32.CloseClipboard()
+
+
+def _restore_clipboard_formats(saved):
+    if not user32.OpenClipboard(0):
+        return False
+    try:
+        user32.EmptyClipboard()
+        for fmt, data in saved:
+            if not _is_memory_format(fmt):
+                continue
+            h = kernel32.GlobalAlloc(GMEM_MOVEABLE, len(data))
+            if not h:
+                continue
+            # The clipboard owns h only once SetClipboardData succeeds.
+            if not _fill_global(h, data) or not user32.SetClipboardData(fmt, h):
+                kernel32.GlobalFree(h)
+        return True
+    finally:
+        user32.CloseClipboard()
+
+
 # ---------------------------------------------------------------------------
 # Window detection
 # ---------------------------------------------------------------------------
@@ -183,7 +268,8 @@ def _release_modifiers():
             user32.SendInput(1, ctypes.byref(inp), ctypes.sizeof(INPUT))
             released.append(vk)
     if released:
-        time.sleep(0.05)
+        wait_until("modifiers.release",
+                   lambda: not any(user32.GetAsyncKeyState(vk) & 0x8000 for vk in released))
     return released
 
 
@@ -218,6 +304,20 @@ def _send_ctrl_shift_v():
     return user32.SendInput(6, ctypes.byref(inputs), ctypes.sizeof(INPUT))
 
 
+def _send_backspaces(count):
+    _release_modifiers()
+    if count <= 0:
+        return 0
+    inputs = (INPUT * (count * 2))()
+    for i in range(count):
+        inputs[i * 2].type = INPUT_KEYBOARD
+        inputs[i * 2].union.ki.wVk = VK_BACK
+        inputs[i * 2 + 1].type = INPUT_KEYBOARD
+        inputs[i * 2 + 1].union.ki.wVk = VK_BACK
+        inputs[i * 2 + 1].union.ki.dwFlags = KEYEVENTF_KEYUP
+    return user32.SendInput(count * 2, ctypes.byref(inputs), ctypes.sizeof(INPUT))
+
+
 def _type_unicode(text):
     _release_modifiers()
     n = len(text)
@@ -278,6 +378,13 @@ class WindowsFocusManager(PlatformFocusManager):
     def saved_window_id(self):
         return self._saved_hwnd
 
+    def restore_token(self, token):
+        self._saved_hwnd = token
+        return self.restore_focus()
+
+    def active_window_id(self):
+        return user32.GetForegroundWindow() or None
+
 
 class WindowsTextInjector(PlatformTextInjector):
     def inject_text(self, text, target_window_id=None, preserve_clipboard=True):
@@ -294,40 +401,108 @@ class WindowsTextInjector(PlatformTextInjector):
         _dbg(f"is_electron={is_electron}")
 
         if target_window_id and is_term:
-            _set_clipboard_text(text)
-            time.sleep(0.05)
-            sent = _type_unicode(text)
+            # Typed directly; the clipboard copy is only a convenience.
+            with tracer.span("clipboard.set"):
+                _set_clipboard_text(text)
+            with tracer.span("keystroke"):
+                sent = _type_unicode(text)
             _dbg(f"UNICODE SendInput returned {sent} (expected {len(text)*2})")
         else:
             old_clipboard = None
             if preserve_clipboard:
-                old_clipboard = _get_clipboard_text()
+                old_clipboard = self.save_clipboard()
 
-            _set_clipboard_text(text)
-            time.sleep(0.05)
+            with tracer.span("clipboard.set"):
+                _set_clipboard_text(text)
+            wait_until("clipboard.set", lambda: _get_clipboard_text() == text)
 
-            if is_electron:
-                sent = _send_ctrl_shift_v()
-                _dbg(f"Ctrl+Shift+V SendInput returned {sent} (expected 6)")
-            else:
-                sent = _send_ctrl_v()
-                _dbg(f"Ctrl+V SendInput returned {sent} (expected 4)")
-            time.sleep(0.05)
+            with tracer.span("keystroke"):
+                if is_electron:
+                    sent = _send_ctrl_shift_v()
+                    _dbg(f"Ctrl+Shift+V SendInput returned {sent} (expected 6)")
+                else:
+                    sent = _send_ctrl_v()
+                    _dbg(f"Ctrl+V SendInput returned {sent} (expected 4)")
 
             if preserve_clipboard and old_clipboard is not None:
-                time.sleep(0.2)
-                _set_clipboard_text(old_clipboard)
+                settle("paste.settle")
+                self.restore_clipboard(old_clipboard)
+
+    def delete_chars(self, count):
+        with tracer.span("keystroke.backspace"):
+            sent = _send_backspaces(count)
+        _dbg(f"Backspace SendInput returned {sent} (expected {count * 2})")
+
+    def save_clipboard(self):
+        with tracer.span("clipboard.save"):
+            return _save_clipboard_formats()
+
+    def restore_clipboard(self, snapshot):
+        with tracer.span("clipboard.restore"):
+            _restore_clipboard_formats(snapshot)
+
+    def type_text(self, text):
+        with tracer.span("keystroke.type"):
+            sent = _type_unicode(text)
+        _dbg(f"UNICODE SendInput returned {sent} (expected {len(text) * 2})")
 
 
 class WindowsHotkeyManager(PlatformHotkeyManager):
-    """Wraps the ``keyboard`` library (Windows-only, with suppression)."""
+    """Wraps the ``keyboard`` library (Windows-only, with suppression).
+
+    A suppressing hook swallows its combination even when the callback
+    ignores it, so muting removes the hooks and unmuting adds them back.
+    """
 
     def __init__(self):
         import keyboard as _kb
         self._kb = _kb
+        self._bindings = {}  # hotkey_str -> (callback, suppress)
+        self._handles = {}  # hotkey_str -> handle from add_hotkey
+        self._lock = threading.Lock()
 
     def register(self, hotkey_str, callback, *, suppress=True):
-        self._kb.add_hotkey(hotkey_str, callback, suppress=suppress)
+        with self._lock:
+            if self.muted:
+                self._kb.parse_hotkey(hotkey_str)  # still reject bad hotkeys
+            else:
+                self._add(hotkey_str, callback, suppress)
+            self._bindings[hotkey_str] = (callback, suppress)
+
+    def unregister(self, hotkey_str):
+        with self._lock:
+            self._bindings.pop(hotkey_str, None)
+            self._remove(hotkey_str)
 
     def unregister_all(self):
-        self._kb.unhook_all()
+        with self._lock:
+            self._bindings.clear()
+            self._handles.clear()
+            self._kb.unhook_all()
+
+    def mute(self):
+        with self._lock:
+            super().mute()
+            for hotkey_str in list(self._handles):
+                self._remove(hotkey_str)
+
+    def unmute(self):
+        with self._lock:
+            super().unmute()
+            for hotkey_str, (callback, suppress) in self._bindings.items():
+                self._add(hotkey_str, callback, suppress)
+
+    def _add(self, hotkey_str, callback, suppress):
+        self._remove(hotkey_str)
+
+        def on_activate():
+            if not self.muted:
+                callback()
+
+        self._handles[hotkey_str] = self._kb.add_hotkey(hotkey_str, on_activate,
+                                                        suppress=suppress)
+
+    def _remove(self, hotkey_str):
+        handle = self._handles.pop(hotkey_str, None)
+        if handle is not None:
+            self._kb.remove_hotkey(handle)
@@ -1,58 +1,170 @@
+import threading
 import time
 
 import numpy as np
-import sounddevice as sd
-import threading
+
+from voice_app.services.audio_buffer import AudioBuffer, RingBuffer
+from voice_app.services.level_meter import LevelMeter
+from voice_app.services.resample import PolyphaseResampler, downmix
+from voice_app.services.vad import EnergyVAD
 
 SAMPLE_RATE = 16000
-SILENCE_RMS_THRESHOLD = 300  # int16 amplitude; below this counts as silence
+# Downmix at most this many device channels; multi-channel interfaces
+# often expose many silent inputs.
+MAX_CHANNELS = 2
+# Audio kept from just before start() when the input is held open.
+PREROLL_SECONDS = 0.5
 
 
 class AudioRecorder:
-    def __init__(self, sample_rate=SAMPLE_RATE):
+    def __init__(self, sample_rate=SAMPLE_RATE, vad=None, preroll=PREROLL_SECONDS):
         self.sample_rate = sample_rate
-        self._chunks = []
+        self.vad = vad if vad is not None else EnergyVAD(sample_rate)
+        # Samples are stored as float32 in [-1, 1] at *sample_rate*, ready
+        # for the transcriber without another conversion.
+        self._buffer = AudioBuffer(capacity=sample_rate * 30, dtype=np.float32)
         self._stream = None
-        self._lock = threading.Lock()
+        self._resampler = None
+        self._mono = np.empty(0, dtype=np.float32)  # downmix scratch for the callback
         self._last_voice_time = 0.0
+        # Live level / band energies for the overlay, fed while recording.
+        self.meter = LevelMeter(sample_rate)
+        # Always-warm mode (keep_warm): the stream stays open between
+        # recordings, feeding the pre-roll ring until start() arms it.
+        self._preroll = RingBuffer(int(sample_rate * preroll), dtype=np.float32)
+        self._warm = False
+        self._armed = False
+        self._recording = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def warm_up():
+        """Import sounddevice (and initialise PortAudio) ahead of the first recording."""
+        import sounddevice  # noqa: F401
+
+    def keep_warm(self):
+        """Hold the input stream open between recordings.
+
+        ``start()`` then only marks a position instead of opening the device,
+        and the recording begins with the last ``preroll`` seconds of audio.
+        """
+        self._warm = True
+        if self._stream is None:
+            self._preroll.clear()
+            self._stream = self._open_stream()
+            self._stream.start()
+
+    def close(self):
+        """Close the input stream, leaving always-warm mode."""
+        self._warm = False
+        self._recording = self._armed = False
+        self._close_stream()
 
     def start(self):
-        self._chunks = []
         self._last_voice_time = time.monotonic()
-        self._stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=1,
-            dtype="int16",
-            callback=self._callback,
-        )
+        if self._warm and self._stream is not None and self._stream.active:
+            # The callback picks this up on its next block.
+            self._armed = True
+            return
+        self._close_stream()
+        self._buffer.reset()
+        self.vad.reset()
+        self.meter.reset()
+        self._preroll.clear()
+        self._stream = self._open_stream()
+        self._recording = True
         self._stream.start()
 
+    def _open_stream(self):
+        """Open the input at the device's native format, else at 16 kHz mono."""
+        import sounddevice as sd
+
+        try:
+            info = sd.query_devices(kind="input")
+            rate = int(info["default_samplerate"])
+            channels = max(1, min(int(info["max_input_channels"]), MAX_CHANNELS))
+        except Exception:
+            rate, channels = self.sample_rate, 1
+        formats = [(rate, channels)]
+        if (rate, channels) != (self.sample_rate, 1):
+            formats.append((self.sample_rate, 1))
+
+        for i, (rate, channels) in enumerate(formats):
+            if self._resampler is None or self._resampler.in_rate != rate:
+                self._resampler = PolyphaseResampler(rate, self.sample_rate)
+            self._resampler.reset()
+            try:
+                return sd.InputStream(
+                    samplerate=rate,
+                    channels=channels,
+                    dtype="float32",
+                    callback=self._callback,
+                )
+            except Exception:
+                if i == len(formats) - 1:
+                    raise
+
     def _callback(self, indata, frames, time_info, status):
-        with self._lock:
-            self._chunks.append(indata.copy())
-        rms = np.sqrt(np.mean(indata.astype(np.float32) ** 2))
-        if rms >= SILENCE_RMS_THRESHOLD:
+        # Scratch arrays are reused, so steady-state blocks allocate nothing.
+        if len(self._mono) < frames:
+            self._mono = np.empty(frames, dtype=np.float32)
+        block = self._resampler.process(downmix(indata, self._mono))
+        if len(block) == 0:
+            return
+        if self._armed:
+            with self._lock:
+                if self._armed:
+                    self._buffer.reset()
+                    self.vad.reset()
+                    self.meter.reset()
+                    self._buffer.write(self._preroll.read())
+                    self._armed = False
+                    self._recording = True
+        if not self._recording:
+            self._preroll.write(block)
+            return
+        self._buffer.write(block)
+        self.meter.feed(block)
+        if self.vad.is_speech(block):
             self._last_voice_time = time.monotonic()
 
     def stop(self):
-        if self._stream is not None:
-            self._stream.stop()
-            self._stream.close()
-            self._stream = None
-
         with self._lock:
-            if not self._chunks:
-                return None
-            audio = np.concatenate(self._chunks, axis=0)
+            armed, self._armed = self._armed, False
+            self._recording = False
+        if not self._warm:
+            self._close_stream()
+        if armed:
+            # Stopped before the callback saw the start.
+            return None
 
+        audio = self._buffer.view()
         duration = len(audio) / self.sample_rate
         if duration < 0.3:
             return None
         return audio
 
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def read(self, start=0, end=None):
+        """Return a zero-copy view of the mono samples captured so far.
+
+        Safe to call from another thread while recording is in progress.
+        """
+        return self._buffer.view(start, end)
+
+    @property
+    def frames_captured(self):
+        """Number of samples captured in the current (or last) recording."""
+        return len(self._buffer)
+
     @property
     def is_recording(self):
-        return self._stream is not None and self._stream.active
+        return self._recording or self._armed
 
     @property
     def silence_duration(self):
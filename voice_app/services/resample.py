@@ -0,0 +1,136 @@
+"""Streaming downmix and polyphase resampling to Whisper's 16 kHz.
+
+The recorder captures at the device's native rate and channel count and
+converts block by block inside the audio callback, instead of asking
+PortAudio / the host API to resample (which varies in quality and fails on
+some devices).
+
+For a rational ratio ``up/down`` the windowed-sinc low-pass is split into
+``up`` phase filters; each output sample is one dot product of a phase
+filter with the most recent input samples.  A block's outputs are computed
+together as a single gather plus ``einsum``, into scratch buffers that are
+only reallocated when a block is larger than any before it, so steady-state
+calls from the audio callback allocate no arrays.
+"""
+
+from math import gcd
+
+import numpy as np
+
+# Filter half-width in zero crossings of the narrower of the input and output
+# band limits; higher is sharper and slower.
+ZERO_CROSSINGS = 16
+# Pass band as a fraction of the output Nyquist frequency.
+ROLLOFF = 0.9
+KAISER_BETA = 8.6
+
+
+def downmix(block, out=None):
+    """Average a ``(frames, channels)`` block to mono float32.
+
+    A multi-channel block is averaged into *out* (float32, at least
+    ``frames`` long) when given, instead of a new array.
+    """
+    if block.ndim == 1:
+        return block.astype(np.float32, copy=False)
+    if block.shape[1] == 1:
+        return block[:, 0].astype(np.float32, copy=False)
+    if out is not None:
+        return np.mean(block, axis=1, dtype=np.float32, out=out[:len(block)])
+    return block.mean(axis=1, dtype=np.float32)
+
+
+def _design_bank(up, down):
+    """Return the ``(up, taps)`` polyphase filter bank for ratio up/down."""
+    # Cut-off in cycles per sample of the upsampled (in_rate * up) signal.
+    cutoff = 0.5 * ROLLOFF / max(up, down)
+    taps = 2 * ZERO_CROSSINGS * max(1, -(-down // up))
+    n = np.arange(up * taps) - (up * taps - 1) / 2.0
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(up * taps, KAISER_BETA)
+    h *= up / h.sum()
+    # bank[p, k] = h[p + k * up]; reversed so the dot product runs oldest-first.
+    return np.ascontiguousarray(h.reshape(taps, up).T[:, ::-1], dtype=np.float32)
+
+
+class PolyphaseResampler:
+    """Stateful mono resampler fed with consecutive blocks of float32 samples."""
+
+    def __init__(self, in_rate, out_rate):
+        in_rate, out_rate = int(round(in_rate)), int(round(out_rate))
+        g = gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.up = out_rate // g
+        self.down = in_rate // g
+        self.passthrough = self.up == self.down
+        if not self.passthrough:
+            self._bank = _design_bank(self.up, self.down)
+            self._taps = self._bank.shape[1]
+            self._offsets = np.arange(self._taps)
+            self._reserve(0)
+        self.reset()
+
+    def _reserve(self, block_len):
+        """Size the scratch buffers for input blocks of up to *block_len* samples."""
+        block_len = max(block_len, 1)
+        outputs = block_len * self.up // self.down + 1
+        taps = self._taps
+        history = getattr(self, "_x", np.zeros(taps - 1, dtype=np.float32))[:taps - 1]
+        # History (the last taps - 1 inputs) followed by the current block.
+        self._x = np.empty(taps - 1 + block_len, dtype=np.float32)
+        self._x[:taps - 1] = history
+        self._ramp = np.arange(outputs)
+        self._pos = np.empty(outputs, dtype=np.intp)
+        self._phase = np.empty(outputs, dtype=np.intp)
+        self._start = np.empty(outputs, dtype=np.intp)
+        self._index = np.empty((outputs, taps), dtype=np.intp)
+        self._windows = np.empty((outputs, taps), dtype=np.float32)
+        self._filters = np.empty((outputs, taps), dtype=np.float32)
+        self._out = np.empty(outputs, dtype=np.float32)
+
+    def reset(self):
+        if self.passthrough:
+            return
+        # Start with a window of silence so the first block needs no special case.
+        self._x[:self._taps - 1] = 0.0
+        self._consumed = 0  # input samples seen, not counting the history pad
+        self._next_out = 0  # index of the next output sample
+
+    def process(self, block):
+        """Resample one mono block; returns however many outputs it completes.
+
+        The result is a view of an internal buffer, valid until the next call.
+        """
+        if self.passthrough:
+            return block
+        n = len(block)
+        keep = self._taps - 1
+        if keep + n > len(self._x):
+            self._reserve(n)
+        x = self._x[:keep + n]
+        x[keep:] = block
+        self._consumed += n
+
+        # Output m sits at input position m * down / up; it is complete once
+        # that sample has arrived.
+        last = (self._consumed * self.up - 1) // self.down
+        count = last + 1 - self._next_out
+        first = self._next_out
+        self._next_out = last + 1
+        if count > 0:
+            pos = np.add(self._ramp[:count], first, out=self._pos[:count])
+            pos *= self.down
+            phase = np.remainder(pos, self.up, out=self._phase[:count])
+            # Index into x of the oldest sample each output needs.
+            start = np.floor_divide(pos, self.up, out=self._start[:count])
+            start -= self._consumed - n
+            index = np.add(start[:, None], self._offsets, out=self._index[:count])
+            windows = np.take(x, index, out=self._windows[:count], mode="clip")
+            filters = np.take(self._bank, phase, axis=0, out=self._filters[:count],
+                              mode="clip")
+            out = np.einsum("ij,ij->i", windows, filters, out=self._out[:count])
+        else:
+            out = self._out[:0]
+        # Slide the newest taps - 1 inputs to the front for the next block.
+        x[:keep] = x[n:]
+        return out
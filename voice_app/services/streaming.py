@@ -0,0 +1,152 @@
+"""Incremental transcription of a recording that is still in progress.
+
+A background worker decodes the uncommitted part of the recording once it
+is long enough and *commits* every segment that ends well before the live
+edge.  When the user stops, only the uncommitted tail is left to decode, so
+stop-to-paste latency stays roughly constant however long the dictation is.
+"""
+
+import sys
+import threading
+
+from voice_app.services.recorder import SAMPLE_RATE
+
+# Decode once this much uncommitted audio has accumulated.
+WINDOW_SECONDS = 6.0
+# Shorter window for live typing, so text appears about a second behind.
+LIVE_WINDOW_SECONDS = 2.0
+# Segments ending closer than this to the live edge stay uncommitted —
+# the speaker may still be in the middle of the word.
+GUARD_SECONDS = 1.0
+# Whisper sees 30 s at most; commit unconditionally before getting close.
+MAX_WINDOW_SECONDS = 24.0
+# Tail of the committed text fed back as prompt context for the next window.
+PROMPT_CONTEXT_CHARS = 200
+POLL_INTERVAL = 0.25
+# How long cancel() waits for an in-flight window decode to finish.
+CANCEL_JOIN_TIMEOUT = 5.0
+
+
+class StreamingTranscriber:
+    """Decode committed windows of *recorder*'s audio while it records.
+
+    *on_update(committed, tentative)* is called from the worker thread after
+    each window decode, with the committed text so far and the text of the
+    segments still too close to the live edge to commit.
+    """
+
+    def __init__(self, transcriber, recorder, language=None, initial_prompt=None,
+                 sample_rate=SAMPLE_RATE, window=WINDOW_SECONDS, on_update=None):
+        self.transcriber = transcriber
+        self.recorder = recorder
+        self.language = language
+        self.initial_prompt = initial_prompt
+        self.sample_rate = sample_rate
+        self.window = window
+        self.on_update = on_update
+        self._committed = 0  # samples already turned into text
+        self._attempted = 0  # capture position at the last window decode
+        self._texts = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop decoding new windows; ``finish()`` can still be called later.
+
+        Call this when the recording stops, before the recorder is reused.
+        """
+        self._stop.set()
+
+    def cancel(self):
+        """Stop the worker and discard everything decoded so far."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=CANCEL_JOIN_TIMEOUT)
+        self._texts = []
+
+    def finish(self, audio):
+        """Decode the uncommitted tail of *audio* and return the full text.
+
+        *audio* is the final buffer returned by ``AudioRecorder.stop()``.
+        Blocks until any in-flight window decode has completed.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+        tail = audio.reshape(-1)[self._committed:]
+        if len(tail) >= self.sample_rate * 0.1:
+            segments = self.transcriber.transcribe_segments(
+                tail, sample_rate=self.sample_rate,
+                language=self.language, initial_prompt=self._prompt(),
+            )
+            self._texts.extend(seg.text for seg in segments if seg.text)
+        return " ".join(self._texts).strip()
+
+    @property
+    def committed_text(self):
+        return " ".join(self._texts).strip()
+
+    # -- Worker --------------------------------------------------------
+
+    def _run(self):
+        window = int(self.window * self.sample_rate)
+        while not self._stop.wait(POLL_INTERVAL):
+            captured = self.recorder.frames_captured
+            # Don't re-decode a window that had nothing to commit until
+            # enough new audio has arrived to make a difference.
+            if captured - self._committed < window or captured - self._attempted < window // 2:
+                continue
+            self._attempted = captured
+            try:
+                self._decode_window()
+            except Exception as e:
+                # finish() still decodes everything past the last commit.
+                print(f"Streaming decode error: {e}", file=sys.stderr)
+                return
+
+    def _decode_window(self):
+        audio = self.recorder.read(self._committed)
+        # Commit points come from segment end times, so they must be accurate.
+        segments = self.transcriber.transcribe_segments(
+            audio, sample_rate=self.sample_rate,
+            language=self.language, initial_prompt=self._prompt(), timestamps=True,
+        )
+        if self._stop.is_set():
+            # Stopped mid-decode: finish() redoes everything past _committed.
+            return
+        live_edge = len(audio) / self.sample_rate
+        limit = live_edge - GUARD_SECONDS
+
+        committed = []
+        commit_end = None
+        for seg in segments:
+            if seg.end > limit:
+                break
+            committed.append(seg)
+            commit_end = seg.end
+
+        if commit_end is None:
+            if not segments:
+                # Nothing but silence/noise so far — drop it.
+                commit_end = max(limit, 0.0)
+            elif live_edge >= MAX_WINDOW_SECONDS:
+                committed = segments
+                commit_end = segments[-1].end
+
+        if commit_end is not None:
+            self._texts.extend(seg.text for seg in committed if seg.text)
+            self._committed += int(commit_end * self.sample_rate)
+        if self.on_update is not None:
+            tentative = " ".join(seg.text for seg in segments[len(committed):] if seg.text)
+            self.on_update(self.committed_text, tentative)
+
+    def _prompt(self):
+        context = " ".join(self._texts)[-PROMPT_CONTEXT_CHARS:]
+        parts = [p for p in (self.initial_prompt, context) if p]
+        return " ".join(parts) or None
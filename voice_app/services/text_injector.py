@@ -1,8 +1,26 @@
 """Thin facade — delegates to the platform-specific text injector."""
 
+import os
+import queue
+import sys
+import threading
+import time
+
 from voice_app.services.platform import get_text_injector
+from voice_app.services.platform._wait import PASTE_SETTLE_SECONDS
+from voice_app.services.tracing import tracer
+
+_injector = None
+_worker = None
+_worker_lock = threading.Lock()
+_STOP = object()
+
 
-_injector = get_text_injector()
+def _get_injector():
+    global _injector
+    if _injector is None:
+        _injector = get_text_injector()
+    return _injector
 
 
 def inject_text(text, preserve_clipboard=True, target_hwnd=None):
@@ -11,8 +29,183 @@ def inject_text(text, preserve_clipboard=True, target_hwnd=None):
     On Windows *target_hwnd* is a Win32 HWND used to detect terminal vs GUI.
     On other platforms it is an opaque window identifier (pid, xdotool id, etc.).
     """
-    _injector.inject_text(
-        text,
-        target_window_id=target_hwnd,
-        preserve_clipboard=preserve_clipboard,
-    )
+    with tracer.span("inject"):
+        _get_injector().inject_text(
+            text,
+            target_window_id=target_hwnd,
+            preserve_clipboard=preserve_clipboard,
+        )
+
+
+def replace_text(old_text, new_text, preserve_clipboard=True, target_hwnd=None):
+    """Replace the just-injected *old_text* (still before the caret) with *new_text*."""
+    with tracer.span("inject.replace"):
+        injector = _get_injector()
+        injector.delete_chars(len(old_text))
+        injector.inject_text(
+            new_text,
+            target_window_id=target_hwnd,
+            preserve_clipboard=preserve_clipboard,
+        )
+
+
+class InjectionWorker:
+    """Runs clipboard and keystroke work on one background thread.
+
+    Callers enqueue commands and return at once; commands run strictly in
+    order.  Restoring the user's clipboard after a paste is deferred until
+    the paste has settled and nothing else is queued, so back-to-back
+    pastes save it once and restore it once.
+    """
+
+    def __init__(self):
+        self._commands = queue.Queue()
+        self._snapshot = None
+        self._pasted_at = None  # set while a clipboard restore is pending
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, on_done=None):
+        """Run *fn()* on the worker, then *on_done()* (also on the worker)."""
+        self._commands.put((fn, on_done))
+
+    def paste(self, text, target_hwnd=None, preserve_clipboard=True, on_done=None):
+        self.submit(lambda: self._paste(text, target_hwnd, preserve_clipboard), on_done)
+
+    def replace(self, old_text, new_text, target_hwnd=None, on_done=None):
+        def run():
+            with tracer.span("inject.replace"):
+                try:
+                    _get_injector().delete_chars(len(old_text))
+                except NotImplementedError:
+                    print("Correction not supported on this platform", file=sys.stderr)
+                    return
+                self._paste(new_text, target_hwnd, True)
+        self.submit(run, on_done)
+
+    def close(self):
+        """Finish queued work and restore the clipboard, then stop the thread."""
+        self._commands.put(_STOP)
+        self._thread.join(timeout=2)
+
+    def _paste(self, text, target_hwnd, preserve_clipboard):
+        injector = _get_injector()
+        # A restore still pending means the clipboard holds our own text.
+        if preserve_clipboard and self._pasted_at is None:
+            self._snapshot = injector.save_clipboard()
+        with tracer.span("inject"):
+            injector.inject_text(text, target_window_id=target_hwnd,
+                                 preserve_clipboard=False)
+        if preserve_clipboard or self._pasted_at is not None:
+            self._pasted_at = time.perf_counter()
+
+    def _restore_clipboard(self):
+        snapshot, self._snapshot = self._snapshot, None
+        tracer.record("wait.paste.settle", time.perf_counter() - self._pasted_at)
+        self._pasted_at = None
+        if snapshot is not None:
+            try:
+                _get_injector().restore_clipboard(snapshot)
+            except Exception as e:
+                print(f"Clipboard restore error: {e}", file=sys.stderr)
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._pasted_at is not None:
+                timeout = max(0.0, self._pasted_at + PASTE_SETTLE_SECONDS - time.perf_counter())
+            try:
+                command = self._commands.get(timeout=timeout)
+            except queue.Empty:
+                self._restore_clipboard()
+                continue
+            if command is _STOP:
+                if self._pasted_at is not None:
+                    self._restore_clipboard()
+                return
+            fn, on_done = command
+            try:
+                fn()
+            except Exception as e:
+                print(f"Paste error: {e}", file=sys.stderr)
+            if on_done is not None:
+                try:
+                    on_done()
+                except Exception as e:
+                    print(f"Paste callback error: {e}", file=sys.stderr)
+
+
+def get_worker():
+    """Return the shared :class:`InjectionWorker`, starting it on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = InjectionWorker()
+        return _worker
+
+
+def close_worker():
+    """Drain and stop the shared worker, if it was ever started."""
+    with _worker_lock:
+        if _worker is not None:
+            _worker.close()
+
+
+# Longest uncommitted tail live injection will type, and so the most it
+# will ever have to erase again when a later decode revises it.
+MAX_TENTATIVE_CHARS = 40
+
+
+class LiveInjection:
+    """Type a dictation into the foreground window while it is being decoded.
+
+    Committed text is typed once and never touched again.  A short
+    uncommitted tail is typed too and rewritten with Backspace when a later
+    decode changes it.  Call from one thread (the Qt main thread); the
+    keystrokes themselves run on the :class:`InjectionWorker`.
+    """
+
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+        self.typed = ""
+        self._closed = False
+
+    def update(self, committed, tentative=""):
+        if self._closed:
+            return
+        if len(tentative) > MAX_TENTATIVE_CHARS:
+            tentative = ""
+        self._sync(self._join(committed, tentative), max_erase=MAX_TENTATIVE_CHARS)
+
+    def finish(self, text):
+        """Bring the window to the final *text* (prefix included)."""
+        self._closed = True
+        self._sync(text)
+
+    def cancel(self):
+        """Erase everything typed so far."""
+        self._closed = True
+        self._sync("")
+
+    def _join(self, committed, tentative):
+        text = " ".join(part for part in (committed, tentative) if part)
+        return self.prefix + text if text else ""
+
+    def _sync(self, text, max_erase=None):
+        keep = len(os.path.commonprefix([self.typed, text]))
+        erase = len(self.typed) - keep
+        if max_erase is not None and erase > max_erase:
+            return
+        insert = text[keep:]
+        if erase or insert:
+            get_worker().submit(lambda: self._apply(erase, insert))
+        self.typed = text
+
+    @staticmethod
+    def _apply(erase, insert):
+        injector = _get_injector()
+        with tracer.span("inject.live"):
+            if erase:
+                injector.delete_chars(erase)
+            if insert:
+                injector.type_text(insert)
@@ -0,0 +1,198 @@
+"""Lightweight latency tracing for the dictation pipeline.
+
+Off by default.  When enabled (``metrics_log`` and/or ``metrics_port`` in
+config) every span and stage transition is kept in a rolling window per
+name, optionally appended to a JSONL log, and served as JSON percentiles
+from ``http://127.0.0.1:<metrics_port>/metrics``.  Gauges (plain values
+such as the overlay's frames per minute) are served as their latest value.
+
+    from voice_app.services.tracing import tracer
+
+    with tracer.span("clipboard.set"):
+        ...
+    stages = tracer.stages()       # one per dictation
+    stages.mark("recording")
+    stages.mark("transcribing")    # records "stage:recording->transcribing"
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+WINDOW = 512  # samples kept per name
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    def __init__(self, window=WINDOW):
+        self.enabled = False
+        self._window = window
+        self._samples = {}
+        self._counts = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self._log = None
+        self._server = None
+
+    # -- Setup ---------------------------------------------------------
+
+    def configure(self, log_path=None, port=None):
+        """Enable tracing if a log file or endpoint port is given."""
+        if log_path:
+            try:
+                self._log = open(log_path, "a", encoding="utf-8", buffering=1)
+            except OSError as e:
+                print(f"[WhisperType] Cannot open metrics log {log_path}: {e}", file=sys.stderr)
+        if port:
+            self._start_server(int(port))
+        self.enabled = self._log is not None or self._server is not None
+
+    def _start_server(self, port):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        tracer = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(tracer.snapshot(), indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        except OSError as e:
+            print(f"[WhisperType] Metrics endpoint on port {port} failed: {e}", file=sys.stderr)
+            return
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self.enabled = False
+
+    # -- Recording -----------------------------------------------------
+
+    def record(self, name, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self._window)
+            samples.append(seconds)
+            self._counts[name] = self._counts.get(name, 0) + 1
+            if self._log is not None:
+                self._log.write(json.dumps({
+                    "t": round(time.time(), 3), "name": name, "ms": round(seconds * 1000, 3),
+                }) + "\n")
+
+    def gauge(self, name, value):
+        """Set the current value of *name*."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[name] = value
+            if self._log is not None:
+                self._log.write(json.dumps({
+                    "t": round(time.time(), 3), "name": name, "value": value,
+                }) + "\n")
+
+    def span(self, name):
+        """Context manager timing the enclosed block as *name*."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def stages(self):
+        """Return a :class:`StageClock` for one dictation."""
+        return StageClock(self)
+
+    # -- Reporting -----------------------------------------------------
+
+    def snapshot(self):
+        """Return ``{name: {count, p50_ms, p95_ms, p99_ms, max_ms}}`` over the window.
+
+        Gauges appear as ``{name: {"value": value}}``.
+        """
+        with self._lock:
+            items = [(name, sorted(s), self._counts[name]) for name, s in self._samples.items()]
+            gauges = dict(self._gauges)
+        result = {}
+        for name, values, count in sorted(items):
+            def pct(q):
+                return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 3)
+            result[name] = {
+                "count": count,
+                "p50_ms": pct(0.50),
+                "p95_ms": pct(0.95),
+                "p99_ms": pct(0.99),
+                "max_ms": round(values[-1] * 1000, 3),
+            }
+        for name, value in sorted(gauges.items()):
+            result[name] = {"value": value}
+        return result
+
+
+class StageClock:
+    """Stage transitions of a single dictation.
+
+    Each dictation gets its own clock, so queued dictations moving through
+    the pipeline at the same time don't mix their transitions.  A clock is
+    only used by one thread at a time as its dictation is handed along.
+    """
+
+    def __init__(self, tracer):
+        self._tracer = tracer
+        self._stage = None
+        self._time = 0.0
+
+    def mark(self, name):
+        """Enter stage *name*, recording the time since the previous one.
+
+        Passing ``"idle"`` ends the dictation.
+        """
+        if not self._tracer.enabled:
+            return
+        now = time.perf_counter()
+        if self._stage is not None:
+            self._tracer.record(f"stage:{self._stage}->{name}", now - self._time)
+        self._stage = None if name == "idle" else name
+        self._time = now
+
+
+tracer = Tracer()
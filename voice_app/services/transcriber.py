@@ -1,33 +1,139 @@
+import sys
+import threading
+from collections import namedtuple
+
 import numpy as np
-from faster_whisper import WhisperModel
+
+from voice_app.config.settings import AUTO_FAST_MAX_SECONDS, DECODE_PROFILES
+
+Segment = namedtuple("Segment", ["start", "end", "text"])
+
+# Profile keys that configure the model at load time rather than per call.
+_LOAD_OPTIONS = ("cpu_threads", "num_workers")
+
+
+def decode_profile(name, duration=None):
+    """Return the DECODE_PROFILES entry for *name*.
+
+    ``"auto"`` (or None) resolves by utterance *duration* in seconds; with no
+    duration it resolves to ``"balanced"``.
+    """
+    if name in (None, "auto"):
+        fast = duration is not None and duration <= AUTO_FAST_MAX_SECONDS
+        name = "fast" if fast else "balanced"
+    profile = DECODE_PROFILES.get(name)
+    if profile is None:
+        print(f"[WhisperType] Unknown decode profile {name!r}, using balanced.", file=sys.stderr)
+        profile = DECODE_PROFILES["balanced"]
+    return profile
 
 
 class Transcriber:
     def __init__(self):
         self.model = None
         self.model_name = None
+        self.compute_type = None
+        self.profile = "auto"
+        self._swap_lock = threading.Lock()
+
+    def load_model(self, model_name="base", model_path=None, compute_type="int8",
+                   cpu_threads=None, num_workers=None, profile=None, cache=None):
+        """Load the model.
+
+        *profile* becomes the default decode profile; its thread settings are
+        used unless *cpu_threads*/*num_workers* are given.  *num_workers* > 1
+        lets that many threads decode in parallel.  With a
+        :class:`~voice_app.services.model_cache.ModelCache`, hub names are
+        loaded from the local cache instead of being resolved every launch.
 
-    def load_model(self, model_name="base", model_path=None, compute_type="int8"):
-        self.model_name = model_name
-        model_id = model_path if model_path else model_name
-        self.model = WhisperModel(model_id, device="cpu", compute_type=compute_type)
+        Safe to call again on a loaded transcriber to switch models while
+        other threads are decoding.
+        """
+        if profile is not None:
+            self.profile = profile
+        defaults = decode_profile(self.profile)
+        if cpu_threads is None:
+            cpu_threads = defaults["cpu_threads"]
+        if num_workers is None:
+            num_workers = defaults["num_workers"]
 
-    def transcribe(self, audio, sample_rate=16000, language=None, initial_prompt=None):
-        if self.model is None:
+        # Build the new model first and swap it in whole: decodes already
+        # running keep their reference to the old one, which is freed when
+        # the last of them returns.
+        model = self._create_model(model_name, model_path, compute_type,
+                                   cpu_threads, num_workers, cache)
+        with self._swap_lock:
+            old = self.model
+            self.model = model
+            self.model_name = model_name
+            self.compute_type = compute_type
+        del old
+
+    @staticmethod
+    def _create_model(model_name, model_path, compute_type, cpu_threads, num_workers, cache):
+        # faster_whisper pulls in ctranslate2 and friends; import it here, on
+        # the loading thread, rather than at application startup.
+        from faster_whisper import WhisperModel
+
+        if model_path or cache is None:
+            model_id = model_path if model_path else model_name
+            return WhisperModel(model_id, device="cpu", compute_type=compute_type,
+                                cpu_threads=cpu_threads, num_workers=num_workers)
+
+        try:
+            model = WhisperModel(cache.resolve(model_name, compute_type), device="cpu",
+                                 compute_type=compute_type,
+                                 cpu_threads=cpu_threads, num_workers=num_workers)
+        except Exception:
+            # A damaged cache entry is re-fetched once; anything else is real.
+            if cache.verify(model_name, force=True):
+                raise
+            model = WhisperModel(cache.resolve(model_name, compute_type), device="cpu",
+                                 compute_type=compute_type,
+                                 cpu_threads=cpu_threads, num_workers=num_workers)
+        else:
+            cache.verify_async(model_name)
+        return model
+
+    def transcribe(self, audio, sample_rate=16000, language=None, initial_prompt=None,
+                   profile=None):
+        segments = self.transcribe_segments(
+            audio, sample_rate=sample_rate, language=language, initial_prompt=initial_prompt,
+            profile=profile,
+        )
+        text = " ".join(seg.text for seg in segments)
+        return text.strip()
+
+    def transcribe_segments(self, audio, sample_rate=16000, language=None, initial_prompt=None,
+                            profile=None, timestamps=False):
+        """Decode *audio* and return a list of :class:`Segment` with times in seconds.
+
+        *profile* overrides the default decode profile for this call.  Pass
+        *timestamps* when segment boundaries must be accurate (streaming,
+        subtitles); otherwise the profile decides.
+        """
+        model = self.model  # one model for the whole call, even mid-swap
+        if model is None:
             raise RuntimeError("Model not loaded")
 
-        # Convert int16 audio to float32 normalized to [-1, 1]
+        # The recorder already captures float32 in [-1, 1], so its buffer
+        # views go straight through; int16 from other sources is converted
+        # with a single copy.
+        audio = audio.reshape(-1)
         if audio.dtype == np.int16:
-            audio_f32 = audio.flatten().astype(np.float32) / 32768.0
+            audio_f32 = audio.astype(np.float32)
+            audio_f32 *= 1.0 / 32768.0
         else:
-            audio_f32 = audio.flatten().astype(np.float32)
+            audio_f32 = np.ascontiguousarray(audio, dtype=np.float32)
 
-        kwargs = {}
+        options = decode_profile(profile or self.profile, len(audio_f32) / sample_rate)
+        kwargs = {k: v for k, v in options.items() if k not in _LOAD_OPTIONS}
+        if timestamps:
+            kwargs["without_timestamps"] = False
         if language:
             kwargs["language"] = language
         if initial_prompt:
             kwargs["initial_prompt"] = initial_prompt
 
-        segments, _info = self.model.transcribe(audio_f32, **kwargs)
-        text = " ".join(seg.text.strip() for seg in segments)
-        return text.strip()
+        segments, _info = model.transcribe(audio_f32, **kwargs)
+        return [Segment(seg.start, seg.end, seg.text.strip()) for seg in segments]
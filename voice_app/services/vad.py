@@ -0,0 +1,235 @@
+"""Voice activity detection for silence auto-stop and trimming.
+
+Engines answer two questions: "is this live block speech?" (drives the
+silence auto-stop while recording) and "where is the speech in this
+buffer?" (used to trim leading/trailing silence before decoding, so less
+audio is sent to Whisper).
+"""
+
+import sys
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+
+# Frames must clear the noise floor by this much to count as voiced speech.
+SPEECH_MARGIN_DB = 9.0
+# Quieter frames still count when they look like unvoiced consonants
+# ("s", "f", "th"), which have a high zero-crossing rate.
+UNVOICED_MARGIN_DB = 4.0
+UNVOICED_ZCR = 0.25
+# Nothing below this level is speech, however quiet the room is.
+ABSOLUTE_MIN_DB = -55.0
+# The live noise floor is the quietest frame of the last few seconds
+# (minimum statistics): pauses between words reveal the room's noise level,
+# and a louder room is learned within one window.  Each recording starts
+# from a quiet assumed floor so a speaker who starts talking immediately is
+# never mistaken for background noise.
+FLOOR_WINDOW_S = 3.0
+INITIAL_FLOOR_DB = -60.0
+# Trimming estimates the floor from the buffer itself; cap it well below
+# speech level so a recording that is voiced throughout still has speech.
+TRIM_FLOOR_MAX_DB = -45.0
+
+# Segment smoothing for trimming.
+MIN_SPEECH_S = 0.1
+MERGE_GAP_S = 0.3
+
+
+def _to_float(audio):
+    audio = audio.reshape(-1)
+    if audio.dtype == np.int16:
+        return audio.astype(np.float32) * (1.0 / 32768.0)
+    return audio.astype(np.float32, copy=False)
+
+
+class _Scratch:
+    """Arrays for frame_features() and _speech_mask(), reused across live blocks."""
+
+    def __init__(self, frame_len, frames=0):
+        self.frame_len = frame_len
+        self.frames = frames
+        self.squares = np.empty((frames, frame_len), dtype=np.float32)
+        self.signs = np.empty((frames, frame_len), dtype=bool)
+        self.flips = np.empty((frames, max(frame_len - 1, 0)), dtype=bool)
+        self.energy = np.empty(frames, dtype=np.float32)
+        self.zcr = np.empty(frames, dtype=np.float32)
+        self.mask = np.empty((2, frames), dtype=bool)
+
+
+def frame_features(audio, frame_len, scratch=None):
+    """Return per-frame (energy in dBFS, zero-crossing rate) arrays.
+
+    With *scratch* (a ``_Scratch`` for *frame_len*) the results are views of
+    its arrays, valid until its next use.
+    """
+    x = _to_float(audio)
+    n = len(x) // frame_len
+    if n == 0:
+        if len(x) == 0:
+            return np.empty(0, np.float32), np.empty(0, np.float32)
+        n, frame_len = 1, len(x)
+    if scratch is None or scratch.frame_len != frame_len or scratch.frames < n:
+        scratch = _Scratch(frame_len, n)
+    frames = x[:n * frame_len].reshape(n, frame_len)
+    squares = np.multiply(frames, frames, out=scratch.squares[:n])
+    energy = np.mean(squares, axis=1, out=scratch.energy[:n])
+    energy += 1e-10
+    np.log10(energy, out=energy)
+    energy *= 10.0
+    signs = np.signbit(frames, out=scratch.signs[:n])
+    flips = np.not_equal(signs[:, 1:], signs[:, :-1], out=scratch.flips[:n])
+    zcr = np.sum(flips, axis=1, dtype=np.float32, out=scratch.zcr[:n])
+    zcr /= max(frame_len - 1, 1)
+    return energy, zcr
+
+
+def _speech_mask(energy, zcr, floor, scratch=None):
+    n = len(energy)
+    if scratch is None or scratch.frames < n:
+        scratch = _Scratch(0, n)
+    mask, tmp = scratch.mask[0, :n], scratch.mask[1, :n]
+    np.greater(energy, floor + UNVOICED_MARGIN_DB, out=mask)
+    np.greater(zcr, UNVOICED_ZCR, out=tmp)
+    mask &= tmp  # unvoiced consonant
+    np.greater(energy, floor + SPEECH_MARGIN_DB, out=tmp)
+    mask |= tmp  # voiced
+    np.greater(energy, ABSOLUTE_MIN_DB, out=tmp)
+    mask &= tmp
+    return mask
+
+
+def _mask_to_segments(mask, frame_len, sample_rate):
+    """Turn a per-frame boolean mask into merged ``(start, end)`` sample ranges."""
+    if not mask.any():
+        return []
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    merge_gap = int(MERGE_GAP_S * sample_rate / frame_len)
+    min_len = int(MIN_SPEECH_S * sample_rate / frame_len)
+    segments = []
+    for s, e in zip(starts, ends):
+        if segments and s - segments[-1][1] <= merge_gap:
+            segments[-1][1] = e
+        else:
+            segments.append([s, e])
+    return [(int(s * frame_len), int(e * frame_len))
+            for s, e in segments if e - s >= min_len]
+
+
+class VADEngine(ABC):
+    """Detect speech in live blocks and in complete buffers."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * FRAME_MS // 1000
+
+    def reset(self):
+        """Forget adaptive state before a new recording."""
+
+    @abstractmethod
+    def is_speech(self, block):
+        """Return True if the live audio *block* contains speech."""
+
+    @abstractmethod
+    def speech_segments(self, audio):
+        """Return ``(start, end)`` sample ranges of speech in *audio*."""
+
+
+class EnergyVAD(VADEngine):
+    """Energy + zero-crossing detector with an adaptive noise floor."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        super().__init__(sample_rate)
+        self._minima = deque()  # (quietest frame dB, block duration s)
+        # Reused by is_speech(), which runs in the audio callback.
+        self._scratch = _Scratch(self.frame_len)
+        self.reset()
+
+    def reset(self):
+        self._minima.clear()
+        self._minima.append((INITIAL_FLOOR_DB, FLOOR_WINDOW_S))
+        self._window = FLOOR_WINDOW_S
+
+    @property
+    def noise_floor(self):
+        return min(m for m, _ in self._minima)
+
+    def is_speech(self, block):
+        n = len(block) // self.frame_len
+        if n > self._scratch.frames:
+            self._scratch = _Scratch(self.frame_len, n)
+        energy, zcr = frame_features(block, self.frame_len, self._scratch)
+        if len(energy) == 0:
+            return False
+        speech = bool(_speech_mask(energy, zcr, self.noise_floor, self._scratch).any())
+
+        dt = len(block) / self.sample_rate
+        self._minima.append((float(energy.min()), dt))
+        self._window += dt
+        while self._window - self._minima[0][1] >= FLOOR_WINDOW_S:
+            self._window -= self._minima.popleft()[1]
+        return speech
+
+    def speech_segments(self, audio):
+        energy, zcr = frame_features(audio, self.frame_len)
+        if len(energy) == 0:
+            return []
+        # For a complete buffer the quiet end of the distribution is a better
+        # noise estimate than a running one.
+        floor = float(np.clip(np.percentile(energy, 10), INITIAL_FLOOR_DB, TRIM_FLOOR_MAX_DB))
+        return _mask_to_segments(_speech_mask(energy, zcr, floor),
+                                 self.frame_len, self.sample_rate)
+
+
+class SileroVAD(EnergyVAD):
+    """Silero model bundled with faster-whisper for trimming.
+
+    Live blocks still go through the energy detector — running the model
+    inside the audio callback would be far too slow.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        super().__init__(sample_rate)
+        from faster_whisper.vad import get_speech_timestamps
+        self._get_speech_timestamps = get_speech_timestamps
+
+    def speech_segments(self, audio):
+        stamps = self._get_speech_timestamps(_to_float(audio))
+        return [(ts["start"], ts["end"]) for ts in stamps]
+
+
+_ENGINES = {
+    "energy": EnergyVAD,
+    "silero": SileroVAD,
+}
+
+
+def get_vad(name="energy", sample_rate=SAMPLE_RATE):
+    """Build the VAD engine called *name*, falling back to ``energy``."""
+    cls = _ENGINES.get(name or "energy")
+    if cls is None:
+        print(f"[WhisperType] Unknown VAD engine {name!r}, using energy.", file=sys.stderr)
+        cls = EnergyVAD
+    try:
+        return cls(sample_rate)
+    except Exception as e:
+        print(f"[WhisperType] VAD {name!r} unavailable ({e}), using energy.", file=sys.stderr)
+        return EnergyVAD(sample_rate)
+
+
+def speech_bounds(audio, vad, pad_s=0.2):
+    """Return ``(start, end)`` covering all speech in *audio* plus padding.
+
+    Returns None if no speech was found at all.
+    """
+    segments = vad.speech_segments(audio)
+    if not segments:
+        return None
+    pad = int(pad_s * vad.sample_rate)
+    return max(0, segments[0][0] - pad), min(len(audio), segments[-1][1] + pad)
@@ -0,0 +1,206 @@
+"""Adaptive frame pacing for the overlay's animations.
+
+The overlay animates in a few states (loading, recording, transcribing) and
+can sit on screen for hours.  :class:`FrameScheduler` ticks only while the
+animation could actually be seen, at a rate chosen per state, and counts
+the frames painted (published to the tracer as
+``overlay.frames_per_minute``) so idle power use can be checked.
+"""
+
+import sys
+import time
+from collections import deque
+
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer
+from PySide6.QtGui import QGuiApplication
+
+from voice_app.services.tracing import tracer
+
+# While animating or paused because the screen is locked, check the lock
+# this often.
+LOCK_POLL_MS = 2000
+# Give up on a D-Bus lock query after this long (ms).
+DBUS_TIMEOUT_MS = 200
+# Publish frames_per_minute to the tracer this often while tracing is on.
+REPORT_MS = 60_000
+# Give up waiting for a requested frame after this long (seconds), so a
+# repaint the window system dropped can't stall the animation.
+PAINT_TIMEOUT = 0.25
+
+
+def screen_locked():
+    """Best-effort check for a locked session (False when unknown)."""
+    if sys.platform == "win32":
+        import ctypes
+
+        user32 = ctypes.windll.user32
+        # The input desktop can only be switched to while the session is unlocked.
+        desktop = user32.OpenInputDesktop(0, False, 0x0100)  # DESKTOP_SWITCHDESKTOP
+        if not desktop:
+            return True
+        try:
+            return not user32.SwitchDesktop(desktop)
+        finally:
+            user32.CloseDesktop(desktop)
+    if sys.platform == "darwin":
+        try:
+            from Quartz import CGSessionCopyCurrentDictionary
+        except ImportError:
+            return False
+        session = CGSessionCopyCurrentDictionary()
+        return bool(session and session.get("CGSSessionScreenIsLocked"))
+    if sys.platform.startswith("linux"):
+        return _dbus_screen_locked()
+    return False
+
+
+def _dbus_call(bus, service, path, interface, method, *args):
+    """Blocking D-Bus call with a short timeout; the first reply value, or None."""
+    from PySide6.QtDBus import QDBus, QDBusMessage
+
+    if not bus.isConnected():
+        return None
+    msg = QDBusMessage.createMethodCall(service, path, interface, method)
+    msg.setArguments(list(args))
+    reply = bus.call(msg, QDBus.Block, DBUS_TIMEOUT_MS)
+    if reply.type() != QDBusMessage.ReplyMessage or not reply.arguments():
+        return None
+    value = reply.arguments()[0]
+    # Properties.Get wraps the value in a variant.
+    return value.variant() if hasattr(value, "variant") else value
+
+
+def _dbus_screen_locked():
+    """logind's LockedHint, else the freedesktop screensaver's active state."""
+    try:
+        from PySide6.QtDBus import QDBusConnection
+    except ImportError:
+        return False
+    locked = _dbus_call(QDBusConnection.systemBus(), "org.freedesktop.login1",
+                        "/org/freedesktop/login1/session/auto",
+                        "org.freedesktop.DBus.Properties", "Get",
+                        "org.freedesktop.login1.Session", "LockedHint")
+    if locked is None:
+        locked = _dbus_call(QDBusConnection.sessionBus(), "org.freedesktop.ScreenSaver",
+                            "/org/freedesktop/ScreenSaver", "org.freedesktop.ScreenSaver",
+                            "GetActive")
+    return bool(locked)
+
+
+class FrameScheduler(QObject):
+    """Call ``tick(dt)`` at a set rate while *widget* is visible and exposed.
+
+    ``tick`` advances the animation by *dt* seconds and returns the rect to
+    repaint (or None).  No new tick runs until the previous frame has been
+    painted, so update requests coalesce into Qt's paint cycle, which is
+    vsync-paced where the platform supports it.  The timer stops while the
+    window is hidden, minimised, not exposed (fully covered, or on a
+    sleeping screen, where the platform reports it) or the screen is locked.
+    """
+
+    def __init__(self, widget, tick):
+        super().__init__(widget)
+        self._widget = widget
+        self._tick = tick
+        self._fps = 0
+        self._last = None
+        self._pending_since = None
+        self._painted = deque()
+        self._window = None
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timer)
+        self._lock_timer = QTimer(self)
+        self._lock_timer.setInterval(LOCK_POLL_MS)
+        self._lock_timer.timeout.connect(self._refresh)
+        if tracer.enabled:
+            self._report_timer = QTimer(self)
+            self._report_timer.setInterval(REPORT_MS)
+            self._report_timer.timeout.connect(
+                lambda: tracer.gauge("overlay.frames_per_minute", self.frames_per_minute))
+            self._report_timer.start()
+
+        widget.installEventFilter(self)
+        QGuiApplication.instance().applicationStateChanged.connect(self._refresh)
+
+    def set_rate(self, fps):
+        """Animate at *fps* frames per second; 0 stops ticking."""
+        self._fps = fps
+        self._refresh()
+
+    @property
+    def frames_per_minute(self):
+        """Frames painted (animated or not) during the last 60 seconds."""
+        self._trim(time.monotonic())
+        return len(self._painted)
+
+    def frame_painted(self):
+        """Call at the end of the widget's paintEvent."""
+        self._pending_since = None
+        now = time.monotonic()
+        self._painted.append(now)
+        self._trim(now)
+
+    def _trim(self, now):
+        while self._painted and now - self._painted[0] > 60:
+            self._painted.popleft()
+
+    # -- Visibility ----------------------------------------------------
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.Show and self._window is None:
+            # Exposure is reported to the native window, not the widget.
+            self._window = self._widget.windowHandle()
+            if self._window is not None:
+                self._window.installEventFilter(self)
+        if kind in (QEvent.Show, QEvent.Hide, QEvent.WindowStateChange, QEvent.Expose):
+            self._refresh()
+        return False
+
+    def _visible(self):
+        w = self._widget
+        if not w.isVisible() or w.isMinimized():
+            return False
+        window = w.windowHandle()
+        if window is not None and not window.isExposed():
+            return False
+        return QGuiApplication.applicationState() != Qt.ApplicationSuspended
+
+    def _refresh(self, *args):
+        running = watching = False
+        if self._fps and self._visible():
+            # Locking doesn't always hide or unexpose the window, so keep
+            # polling for it while animating as well as while paused.
+            watching = True
+            running = not screen_locked()
+        if watching:
+            if not self._lock_timer.isActive():
+                self._lock_timer.start()
+        else:
+            self._lock_timer.stop()
+        if running:
+            interval = max(1, round(1000 / self._fps))
+            if interval != self._timer.interval():
+                # setInterval restarts a running timer.
+                self._timer.setInterval(interval)
+            if not self._timer.isActive():
+                self._last = None
+                self._pending_since = None
+                self._timer.start()
+        else:
+            self._timer.stop()
+
+    # -- Ticking -------------------------------------------------------
+
+    def _on_timer(self):
+        now = time.perf_counter()
+        if self._pending_since is not None and now - self._pending_since < PAINT_TIMEOUT:
+            return
+        dt = 1.0 / self._fps if self._last is None else now - self._last
+        self._last = now
+        rect = self._tick(dt)
+        if rect is not None:
+            self._pending_since = now
+            self._widget.update(rect)
@@ -1,10 +1,12 @@
 import math
 import sys
 
-from PySide6.QtCore import Qt, QPointF, QRectF, QTimer, Signal
-from PySide6.QtGui import QPainter, QColor, QPen, QFont, QIcon
+from PySide6.QtCore import Qt, QPointF, QRect, QRectF, QTimer, Signal
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QIcon, QPixmap
 from PySide6.QtWidgets import QWidget, QMenu, QApplication, QSystemTrayIcon
 
+from voice_app.ui.frame_scheduler import FrameScheduler
+
 # Geometry
 COMPACT_SIZE = 80
 EXPANDED_W = 200
@@ -20,8 +22,29 @@ COLORS = {
     "error":        {"bg": "#1E1E2E", "fg": "#FFFFFF", "ring": "#E67E22"},
     "too_short":    {"bg": "#1E1E2E", "fg": "#FFFFFF", "ring": "#E67E22"},
     "preview":      {"bg": "#1E1E2E", "fg": "#FFFFFF", "ring": "#2ECC71"},
+    "correction":   {"bg": "#2E6DA4", "fg": "#FFFFFF", "ring": "#5B9BD5"},
 }
 
+# How long a refined transcript stays clickable.
+CORRECTION_TIMEOUT_MS = 6000
+
+# Static layers kept before the cache is flushed (states x sizes x DPRs).
+MAX_CACHED_LAYERS = 16
+# Region repainted by each animation tick: the spinner / loading dots in the
+# compact circle, or the whole left circle (pulse ring + bars) when recording.
+ICON_ANIM_RECT = QRect(COMPACT_SIZE // 2 - 20, ROW_H // 2 - 20, 40, 40)
+RECORDING_ANIM_RECT = QRect(0, 0, ROW_H, ROW_H)
+BADGE_RECT = QRect(0, 0, 23, 23)
+
+# Live input meter: the recorder's bands are folded into this many bars,
+# which fall back by METER_DECAY every 1/60 s so peaks stay readable.
+METER_BARS = 8
+METER_DECAY = 0.85
+
+# Animation frame rates per state.  Loading can last a long time on a slow
+# model load and needs little smoothness.
+STATE_FPS = {"loading": 10, "transcribing": 20, "recording": 20}
+
 
 def _platform_preview_font():
     """Return a QFont suitable for the current platform."""
@@ -40,21 +63,37 @@ class OverlayWindow(QWidget):
     _state_signal = Signal(str, str)
 
     def __init__(self, root, on_click=None, on_stop=None, on_cancel=None,
-                 initial_pos=None, on_drag_end=None):
+                 initial_pos=None, on_drag_end=None, on_first_paint=None,
+                 on_select_model=None):
         super().__init__()
         self.on_click = on_click
         self.on_stop = on_stop
         self.on_cancel = on_cancel
         self.on_drag_end = on_drag_end
+        self.on_first_paint = on_first_paint
+        self.on_select_model = on_select_model
         self._state = "loading"
         self._preview_text = ""
+        self._queue_depth = 0
+
+        # Model menu: choices, current selection, and a pending switch if any
+        self._model_choices = ()
+        self._compute_choices = ()
+        self._current_model = (None, None)
+        self._model_pending = None
 
         # Animation state
-        self._pulse_phase = 0
-        self._spin_angle = 0
-        self._loading_angle = 0
+        self._pulse_phase = 0.0
+        self._spin_angle = 0.0
+        self._loading_angle = 0.0
         self._wave_phase = 0.0
 
+        # Live level meter (recorder's LevelMeter, set via set_level_meter)
+        self._meter = None
+        self._meter_bands = None
+        self._meter_bars = [0.0] * METER_BARS
+        self._meter_level = 0.0
+
         # Drag state
         self._drag_start = None
         self._drag_moved = False
@@ -63,6 +102,9 @@ class OverlayWindow(QWidget):
         self._btn_check = None
         self._btn_cancel = None
 
+        # Pre-rendered static layers, keyed by state / size / DPR / text
+        self._layers = {}
+
         self._cur_w = COMPACT_SIZE
         self._cur_h = ROW_H
 
@@ -92,10 +134,8 @@ class OverlayWindow(QWidget):
         self.setGeometry(x, y, COMPACT_SIZE, ROW_H)
         self.setFixedSize(COMPACT_SIZE, ROW_H)
 
-        # Animation timer (50 ms interval)
-        self._anim_timer = QTimer(self)
-        self._anim_timer.setInterval(50)
-        self._anim_timer.timeout.connect(self._animate_tick)
+        # Animation frames, paced per state and paused when not visible
+        self._frames = FrameScheduler(self, self._animate_tick)
 
         # Auto-return timer (single-shot)
         self._auto_return_timer = QTimer(self)
@@ -117,11 +157,49 @@ class OverlayWindow(QWidget):
             return
         self._tray = QSystemTrayIcon(icon, self)
         tray_menu = QMenu()
-        tray_menu.addAction("Exit", lambda: QApplication.instance().quit())
+        tray_menu.aboutToShow.connect(lambda: self._fill_menu(tray_menu))
+        self._fill_menu(tray_menu)
         self._tray.setContextMenu(tray_menu)
         self._tray.setToolTip("WhisperType")
         self._tray.show()
 
+    def _fill_menu(self, menu):
+        """(Re)build the tray or context menu so it reflects the current model."""
+        menu.clear()
+        if self.on_select_model and self._model_choices:
+            model, compute_type = self._current_model
+            sub = menu.addMenu("Model")
+            for name in self._model_choices:
+                act = sub.addAction(name, lambda n=name: self.on_select_model(n, None))
+                act.setCheckable(True)
+                act.setChecked(name == model)
+            sub = menu.addMenu("Compute type")
+            for name in self._compute_choices:
+                act = sub.addAction(name, lambda n=name: self.on_select_model(None, n))
+                act.setCheckable(True)
+                act.setChecked(name == compute_type)
+            if self._model_pending:
+                menu.addAction(f"Loading {self._model_pending}...").setEnabled(False)
+            menu.addSeparator()
+        menu.addAction("Exit", lambda: QApplication.instance().quit())
+
+    def set_model_menu(self, models, compute_types, current, pending=None):
+        """Update the Model / Compute type submenus.
+
+        *current* is a ``(model, compute_type)`` pair; *pending* names a model
+        being loaded in the background.
+        """
+        self._model_choices = tuple(models)
+        self._compute_choices = tuple(compute_types)
+        self._current_model = current
+        self._model_pending = pending
+        tray = getattr(self, "_tray", None)
+        if tray is not None:
+            tip = f"WhisperType — {current[0]} ({current[1]})"
+            if pending:
+                tip += f", loading {pending}"
+            tray.setToolTip(tip)
+
     @staticmethod
     def _find_icon():
         """Locate the app icon, works both in dev and PyInstaller bundle."""
@@ -180,52 +258,98 @@ class OverlayWindow(QWidget):
         """Thread-safe — can be called from any thread."""
         self._state_signal.emit(state, text)
 
+    @property
+    def state(self):
+        return self._state
+
     def _set_state_impl(self, state, text):
         self._state = state
         self._preview_text = text
 
-        self._anim_timer.stop()
         self._auto_return_timer.stop()
 
         if state == "recording":
             self._resize(EXPANDED_W, ROW_H)
-        elif state == "preview":
+        elif state in ("preview", "correction"):
             self._resize(PREVIEW_W, ROW_H)
         else:
             self._resize(COMPACT_SIZE, ROW_H)
 
         if state in ("loading", "recording", "transcribing"):
             if state == "loading":
-                self._loading_angle = 0
+                self._loading_angle = 0.0
             elif state == "recording":
-                self._pulse_phase = 0
+                self._pulse_phase = 0.0
                 self._wave_phase = 0.0
+                self._meter_bars = [0.0] * METER_BARS
+                self._meter_level = 0.0
+                self._btn_check, self._btn_cancel = self._recording_buttons()
             else:
-                self._spin_angle = 0
-            self._anim_timer.start()
+                self._spin_angle = 0.0
         elif state == "error":
             self._auto_return_timer.start(1200)
         elif state == "too_short":
             self._auto_return_timer.start(800)
         elif state == "preview":
             self._auto_return_timer.start(2000)
+        elif state == "correction":
+            self._auto_return_timer.start(CORRECTION_TIMEOUT_MS)
 
+        self._frames.set_rate(self._frame_rate(state))
         self.update()
 
+    def set_queue_depth(self, depth):
+        """Show how many dictations are still waiting to be transcribed."""
+        if depth != self._queue_depth:
+            self._queue_depth = depth
+            self.update()
+
+    def set_level_meter(self, meter):
+        """Drive the recording animation from *meter* (a LevelMeter) instead of a canned wave."""
+        # numpy is already loaded by the recorder; importing it here keeps it
+        # out of the first paint.
+        import numpy as np
+
+        self._meter = meter
+        self._meter_bands = np.zeros(meter.n_bands, dtype=np.float32) if meter else None
+
+    def _frame_rate(self, state):
+        """Animation frames per second for *state* (0 when nothing moves)."""
+        return STATE_FPS.get(state, 0)
+
     def _auto_return_idle(self):
-        self.set_state("idle")
+        self.set_state("transcribing" if self._queue_depth else "idle")
 
     # -- Animation -----------------------------------------------------
 
-    def _animate_tick(self):
+    def _animate_tick(self, dt):
+        """Advance the animation by *dt* seconds; returns the rect to repaint."""
         if self._state == "loading":
-            self._loading_angle = (self._loading_angle + 8) % 360
+            self._loading_angle = (self._loading_angle + 160 * dt) % 360
         elif self._state == "recording":
-            self._pulse_phase = (self._pulse_phase + 1) % 20
-            self._wave_phase += 0.3
+            if self._meter is not None:
+                self._read_meter(dt)
+            else:
+                self._pulse_phase = (self._pulse_phase + 20 * dt) % 20
+                self._wave_phase += 6 * dt
         elif self._state == "transcribing":
-            self._spin_angle = (self._spin_angle + 15) % 360
-        self.update()
+            self._spin_angle = (self._spin_angle + 300 * dt) % 360
+        return self._anim_rect()
+
+    def _read_meter(self, dt):
+        decay = METER_DECAY ** (dt * 60)
+        level = self._meter.read(self._meter_bands)
+        bars = self._meter_bands.reshape(METER_BARS, -1).max(axis=1).tolist()
+        self._meter_bars = [max(b, old * decay) for b, old in zip(bars, self._meter_bars)]
+        self._meter_level = max(level, self._meter_level * decay)
+
+    def _anim_rect(self):
+        """Widget region that changes between animation frames, or None."""
+        if self._state == "recording":
+            return RECORDING_ANIM_RECT
+        if self._state in ("loading", "transcribing"):
+            return ICON_ANIM_RECT
+        return None
 
     # -- Paint ---------------------------------------------------------
 
@@ -234,15 +358,55 @@ class OverlayWindow(QWidget):
         p.setRenderHint(QPainter.Antialiasing)
 
         colors = COLORS.get(self._state, COLORS["idle"])
+        dirty = event.rect()
+
+        # Everything but the animation comes from a cached pixmap; Qt clips
+        # the blit (and the drawing below) to the dirty region.
+        p.drawPixmap(0, 0, self._static_layer(colors))
+
+        anim = self._anim_rect()
+        if anim is not None and anim.intersects(dirty):
+            if self._state == "recording":
+                self._draw_recording_anim(p, colors)
+            elif self._state == "loading":
+                self._draw_loading_dots(p, COMPACT_SIZE / 2, COMPACT_SIZE / 2, colors["fg"])
+            else:
+                self._draw_spinner_arcs(p, COMPACT_SIZE / 2, COMPACT_SIZE / 2, colors["fg"])
 
-        if self._state == "recording":
-            self._draw_recording_expanded(p, colors)
-        elif self._state == "preview":
-            self._draw_preview(p, colors)
-        else:
-            self._draw_compact(p, colors)
+        if ((self._queue_depth > 1 or (self._queue_depth and self._state == "recording"))
+                and BADGE_RECT.intersects(dirty)):
+            self._draw_queue_badge(p)
 
         p.end()
+        self._frames.frame_painted()
+
+        if self.on_first_paint:
+            callback, self.on_first_paint = self.on_first_paint, None
+            callback()
+
+    def _static_layer(self, colors):
+        """Return the pixmap holding the current state's non-animated parts."""
+        dpr = self.devicePixelRatioF()
+        text = self._preview_text if self._state in ("preview", "correction") else ""
+        key = (self._state, self._cur_w, self._cur_h, dpr, text)
+        pix = self._layers.get(key)
+        if pix is None:
+            if len(self._layers) >= MAX_CACHED_LAYERS:
+                self._layers.clear()
+            pix = QPixmap(round(self._cur_w * dpr), round(self._cur_h * dpr))
+            pix.setDevicePixelRatio(dpr)
+            pix.fill(Qt.transparent)
+            lp = QPainter(pix)
+            lp.setRenderHint(QPainter.Antialiasing)
+            if self._state == "recording":
+                self._draw_recording_static(lp, colors)
+            elif self._state in ("preview", "correction"):
+                self._draw_preview(lp, colors)
+            else:
+                self._draw_compact(lp, colors)
+            lp.end()
+            self._layers[key] = pix
+        return pix
 
     # -- Compact circle ------------------------------------------------
 
@@ -259,53 +423,50 @@ class OverlayWindow(QWidget):
         p.setBrush(QColor(colors["bg"]))
         p.drawEllipse(QPointF(cx, cy), ir, ir)
 
-        if self._state == "loading":
-            self._draw_loading_dots(p, cx, cy, colors["fg"])
-        elif self._state == "idle":
+        if self._state == "idle":
             self._draw_mic_icon(p, cx, cy, colors["fg"])
-        elif self._state == "transcribing":
-            self._draw_spinner_arcs(p, cx, cy, colors["fg"])
         elif self._state == "error":
             self._draw_error_icon(p, cx, cy)
         elif self._state == "too_short":
             self._draw_clock_icon(p, cx, cy)
 
+    def _draw_queue_badge(self, p):
+        r = 10
+        cx = cy = r + 1
+        p.setPen(QPen(QColor("#1E1E2E"), 1.5))
+        p.setBrush(QColor(COLORS["transcribing"]["ring"]))
+        p.drawEllipse(QPointF(cx, cy), r, r)
+        p.setPen(QColor("#1E1E2E"))
+        font = QFont(self._preview_font)
+        font.setBold(True)
+        p.setFont(font)
+        label = str(self._queue_depth) if self._queue_depth < 10 else "9+"
+        p.drawText(QRectF(cx - r, cy - r, 2 * r, 2 * r), Qt.AlignCenter, label)
+
     # -- Recording expanded --------------------------------------------
 
-    def _draw_recording_expanded(self, p, colors):
-        cx_left = ROW_H / 2
+    @staticmethod
+    def _recording_buttons():
+        """Return the (cx, cy, r) of the stop and cancel buttons."""
         cy = ROW_H / 2
         r = ROW_H / 2 - 3
+        btn_r = 18
+        cx_chk = ROW_H / 2 + r + 12 + btn_r
+        cx_can = cx_chk + btn_r + 8 + btn_r
+        return (cx_chk, cy, btn_r), (cx_can, cy, btn_r)
 
-        pulse = 0.6 + 0.4 * abs(math.sin(self._pulse_phase * math.pi / 10))
-        bright = int(100 + 155 * pulse)
-        pulse_ring = QColor(bright, 0x33, 0x33)
-
-        p.setPen(QPen(pulse_ring, 3.5))
-        p.setBrush(Qt.NoBrush)
-        p.drawEllipse(QPointF(cx_left, cy), r, r)
+    def _draw_recording_static(self, p, colors):
+        cx_left = ROW_H / 2
+        cy = ROW_H / 2
+        r = ROW_H / 2 - 3
 
         ir = r - 5
+
         p.setPen(Qt.NoPen)
         p.setBrush(QColor(colors["bg"]))
         p.drawEllipse(QPointF(cx_left, cy), ir, ir)
 
-        fg = QColor(colors["fg"])
-        bar_w = 5
-        gap = 4
-        total = 3 * bar_w + 2 * gap
-        x_start = cx_left - total / 2
-
-        p.setBrush(fg)
-        for i in range(3):
-            phase_offset = i * 0.7
-            bar_h = 10 + 14 * abs(math.sin(self._wave_phase + phase_offset))
-            bx = x_start + i * (bar_w + gap)
-            rr = bar_w / 2
-            p.drawRoundedRect(QRectF(bx, cy - bar_h / 2, bar_w, bar_h), rr, rr)
-
-        btn_r = 18
-        cx_chk = cx_left + r + 12 + btn_r
+        (cx_chk, _, btn_r), (cx_can, _, _) = self._recording_buttons()
 
         p.setPen(QPen(QColor("#2ECC71"), 2))
         p.setBrush(QColor("#27AE60"))
@@ -319,9 +480,6 @@ class OverlayWindow(QWidget):
             QPointF(cx_chk - 2, cy + 7),
             QPointF(cx_chk + 8, cy - 6),
         ])
-        self._btn_check = (cx_chk, cy, btn_r)
-
-        cx_can = cx_chk + btn_r + 8 + btn_r
 
         p.setPen(QPen(QColor("#E74C3C"), 2))
         p.setBrush(QColor("#C0392B"))
@@ -332,7 +490,51 @@ class OverlayWindow(QWidget):
         p.setPen(pen)
         p.drawLine(QPointF(cx_can - xs, cy - xs), QPointF(cx_can + xs, cy + xs))
         p.drawLine(QPointF(cx_can + xs, cy - xs), QPointF(cx_can - xs, cy + xs))
-        self._btn_cancel = (cx_can, cy, btn_r)
+
+    def _draw_recording_anim(self, p, colors):
+        cx_left = ROW_H / 2
+        cy = ROW_H / 2
+        r = ROW_H / 2 - 3
+
+        if self._meter is not None:
+            # Ring brightness follows the input level: a dead mic stays dim.
+            pulse = self._meter_level
+        else:
+            pulse = 0.6 + 0.4 * abs(math.sin(self._pulse_phase * math.pi / 10))
+        bright = int(100 + 155 * pulse)
+        pulse_ring = QColor(bright, 0x33, 0x33)
+
+        p.setPen(QPen(pulse_ring, 3.5))
+        p.setBrush(Qt.NoBrush)
+        p.drawEllipse(QPointF(cx_left, cy), r, r)
+
+        fg = QColor(colors["fg"])
+        p.setPen(Qt.NoPen)
+        p.setBrush(fg)
+
+        if self._meter is not None:
+            bar_w = 4
+            gap = 2
+            total = METER_BARS * bar_w + (METER_BARS - 1) * gap
+            x_start = cx_left - total / 2
+            rr = bar_w / 2
+            for i, v in enumerate(self._meter_bars):
+                bar_h = 4 + 32 * v
+                bx = x_start + i * (bar_w + gap)
+                p.drawRoundedRect(QRectF(bx, cy - bar_h / 2, bar_w, bar_h), rr, rr)
+            return
+
+        bar_w = 5
+        gap = 4
+        total = 3 * bar_w + 2 * gap
+        x_start = cx_left - total / 2
+
+        for i in range(3):
+            phase_offset = i * 0.7
+            bar_h = 10 + 14 * abs(math.sin(self._wave_phase + phase_offset))
+            bx = x_start + i * (bar_w + gap)
+            rr = bar_w / 2
+            p.drawRoundedRect(QRectF(bx, cy - bar_h / 2, bar_w, bar_h), rr, rr)
 
     # -- Preview -------------------------------------------------------
 
@@ -340,24 +542,28 @@ class OverlayWindow(QWidget):
         cy = ROW_H / 2
         ccx = ROW_H / 2
         r = ROW_H / 2 - 3
+        correction = self._state == "correction"
 
-        p.setPen(QPen(QColor("#2ECC71"), 3.5))
+        p.setPen(QPen(QColor(colors["ring"]), 3.5))
         p.setBrush(Qt.NoBrush)
         p.drawEllipse(QPointF(ccx, cy), r, r)
 
         ir = r - 5
         p.setPen(Qt.NoPen)
-        p.setBrush(QColor("#27AE60"))
+        p.setBrush(QColor(colors["bg"] if correction else "#27AE60"))
         p.drawEllipse(QPointF(ccx, cy), ir, ir)
 
-        pen = QPen(QColor("white"), 3.5, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
-        p.setPen(pen)
-        p.setBrush(Qt.NoBrush)
-        p.drawPolyline([
-            QPointF(ccx - 10, cy + 1),
-            QPointF(ccx - 3, cy + 9),
-            QPointF(ccx + 11, cy - 8),
-        ])
+        if correction:
+            self._draw_refresh_icon(p, ccx, cy)
+        else:
+            pen = QPen(QColor("white"), 3.5, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+            p.setPen(pen)
+            p.setBrush(Qt.NoBrush)
+            p.drawPolyline([
+                QPointF(ccx - 10, cy + 1),
+                QPointF(ccx - 3, cy + 9),
+                QPointF(ccx + 11, cy - 8),
+            ])
 
         bx = ROW_H + 6
         bx_end = PREVIEW_W - 6
@@ -397,6 +603,18 @@ class OverlayWindow(QWidget):
         p.drawLine(QPointF(cx, cy + 14), QPointF(cx, cy + 21))
         p.drawLine(QPointF(cx - 9, cy + 21), QPointF(cx + 9, cy + 21))
 
+    def _draw_refresh_icon(self, p, cx, cy):
+        r = 12
+        pen = QPen(QColor("white"), 3.5, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        p.setPen(pen)
+        p.setBrush(Qt.NoBrush)
+        p.drawArc(QRectF(cx - r, cy - r, 2 * r, 2 * r), 90 * 16, 270 * 16)
+        p.drawPolyline([
+            QPointF(cx - 1, cy - r - 6),
+            QPointF(cx + 5, cy - r),
+            QPointF(cx - 1, cy - r + 6),
+        ])
+
     def _draw_loading_dots(self, p, cx, cy, color):
         c = QColor(color)
         p.setPen(Qt.NoPen)
@@ -509,10 +727,8 @@ class OverlayWindow(QWidget):
 
     def contextMenuEvent(self, event):
         menu = QMenu(self)
-        exit_action = menu.addAction("Exit")
-        action = menu.exec(event.globalPos())
-        if action == exit_action:
-            QApplication.instance().quit()
+        self._fill_menu(menu)
+        menu.exec(event.globalPos())
 
     def _hit_test(self, x, y, cx, cy, r):
         return (x - cx) ** 2 + (y - cy) ** 2 <= r ** 2